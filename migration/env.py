@@ -10,8 +10,9 @@ from alembic import context
 from src.tyuiu_ratings.database import Base
 
 from src.tyuiu_ratings.profiles.models import ExamOrm, ProfileOrm
-from src.tyuiu_ratings.applicants.models import ApplicantOrm
-from src.tyuiu_ratings.ratings.models import RatingOrm
+from src.tyuiu_ratings.applicants.models import ApplicantOrm, ApplicantChangeOrm, SnapshotOrm, SnapshotChunkOrm
+from src.tyuiu_ratings.ratings.models import RatingOrm, RatingSummaryOrm
+from src.tyuiu_ratings.directions.models import DirectionStatsOrm
 
 from src.tyuiu_ratings.settings import PostgresSettings
 
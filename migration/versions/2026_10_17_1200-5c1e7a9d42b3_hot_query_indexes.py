@@ -0,0 +1,53 @@
+"""Hot query indexes
+
+Revision ID: 5c1e7a9d42b3
+Revises: 079cbe2b5a9e
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d42b3'
+down_revision: Union[str, None] = '079cbe2b5a9e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ('ix_applicants_direction_rank_id', 'applicants', ['direction', 'rank', 'id']),
+    ('ix_applicants_applicant_id_priority', 'applicants', ['applicant_id', 'priority']),
+    ('ix_applicants_applicant_id_probability', 'applicants', ['applicant_id', 'probability']),
+    ('ix_exams_applicant_id', 'exams', ['applicant_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индексы строятся без блокировки записи, поэтому вне транзакции миграции
+    with op.get_context().autocommit_block():
+        for name, table_name, columns in INDEXES:
+            op.create_index(
+                name,
+                table_name,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table_name, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True
+            )
@@ -0,0 +1,46 @@
+"""Direction stats
+
+Revision ID: 3a9c5e1f7b28
+Revises: 8d2f4b6a1c07
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a9c5e1f7b28'
+down_revision: Union[str, None] = '8d2f4b6a1c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('direction_stats',
+    sa.Column('direction', sa.String(), nullable=False),
+    sa.Column('applicants_count', sa.Integer(), nullable=False),
+    sa.Column('originals_count', sa.Integer(), nullable=False),
+    sa.Column('min_points', sa.Integer(), nullable=False),
+    sa.Column('max_points', sa.Integer(), nullable=False),
+    sa.Column('avg_points', sa.Float(), nullable=False),
+    sa.Column('points_percentiles', postgresql.ARRAY(sa.Float()), nullable=False),
+    sa.Column('budget_places', sa.Integer(), nullable=True),
+    sa.Column('cutoff_rank', sa.Integer(), nullable=True),
+    sa.Column('cutoff_points', sa.Integer(), nullable=True),
+    sa.Column('cutoff_probability', sa.Float(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('direction', name='unique_direction_stats')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('direction_stats')
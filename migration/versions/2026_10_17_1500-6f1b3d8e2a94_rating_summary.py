@@ -0,0 +1,53 @@
+"""Rating summary
+
+Revision ID: 6f1b3d8e2a94
+Revises: 3a9c5e1f7b28
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.tyuiu_ratings.ratings.repository import build_summary_rebuild
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f1b3d8e2a94'
+down_revision: Union[str, None] = '3a9c5e1f7b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rating_summary',
+    sa.Column('applicant_id', sa.Integer(), nullable=False),
+    sa.Column('direction', sa.String(), nullable=False),
+    sa.Column('days', sa.Integer(), nullable=False),
+    sa.Column('last_rank', sa.Integer(), nullable=False),
+    sa.Column('last_date', sa.DateTime(), nullable=False),
+    sa.Column('previous_rank', sa.Integer(), nullable=True),
+    sa.Column('velocity', sa.Float(), nullable=False),
+    sa.Column('acceleration', sa.Float(), nullable=False),
+    sa.Column('ewma_velocity', sa.Float(), nullable=False),
+    sa.Column('mean_rank', sa.Float(), nullable=False),
+    sa.Column('m2', sa.Float(), nullable=False),
+    sa.Column('window_dates', postgresql.ARRAY(sa.DateTime()), nullable=False),
+    sa.Column('window_changes', postgresql.ARRAY(sa.Integer()), nullable=False),
+    sa.Column('max_change', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('applicant_id', 'direction', name='unique_rating_summary')
+    )
+    # Сводка заполняется из накопленной истории сразу, иначе признаки рассылки считались бы по одному дню
+    op.execute(build_summary_rebuild())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rating_summary')
@@ -0,0 +1,43 @@
+"""Applicant changes applicant index
+
+Revision ID: b7e4a1c93d52
+Revises: 6f1b3d8e2a94
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4a1c93d52'
+down_revision: Union[str, None] = '6f1b3d8e2a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индекс строится без блокировки записи, поэтому вне транзакции миграции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_applicant_changes_applicant_id_id',
+            'applicant_changes',
+            ['applicant_id', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_applicant_changes_applicant_id_id',
+            table_name='applicant_changes',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,50 @@
+"""Snapshots
+
+Revision ID: c3f8d2e61a47
+Revises: b7e4a1c93d52
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8d2e61a47'
+down_revision: Union[str, None] = 'b7e4a1c93d52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('snapshots',
+    sa.Column('snapshot_id', sa.String(), nullable=False),
+    sa.Column('total_chunks', sa.Integer(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('snapshot_id')
+    )
+    op.create_table('snapshot_chunks',
+    sa.Column('snapshot_id', sa.String(), nullable=False),
+    sa.Column('chunk_number', sa.Integer(), nullable=False),
+    sa.Column('directions', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['snapshot_id'], ['snapshots.snapshot_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('snapshot_id', 'chunk_number', name='unique_snapshot_chunk')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('snapshot_chunks')
+    op.drop_table('snapshots')
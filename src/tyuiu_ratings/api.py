@@ -13,6 +13,8 @@ from .broker import create_faststream_app
 
 from .profiles.router import profiles_router
 from .applicants.router import applicants_router
+from .monitoring.router import monitoring_router
+from .directions.router import directions_router
 from .notifications.tasks import create_scheduler_app
 
 logger = logging.getLogger(__name__)
@@ -31,12 +33,16 @@ async def lifespan(_: FastAPI) -> AsyncIterator[None]:
     logger.info("Broker closed")
     scheduler_app.shutdown()
     logger.info("Scheduler stoped")
+    await container.close()
+    logger.info("Container closed")
 
 
 def create_fastapi_app() -> FastAPI:
     app = FastAPI(lifespan=lifespan)
     app.include_router(profiles_router)
     app.include_router(applicants_router)
+    app.include_router(monitoring_router)
+    app.include_router(directions_router)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
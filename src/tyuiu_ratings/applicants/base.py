@@ -1,14 +1,20 @@
 from typing import Optional, TYPE_CHECKING
 
+from datetime import timedelta
+
 if TYPE_CHECKING:
     from ..profiles.schemas import Profile
 
 from abc import ABC, abstractmethod
 
+from ..types import Row
+
 from .dto import (
     ApplicantPredict,
     ApplicantRecommend,
     ApplicantCreate,
+    BulkUpsertResult,
+    ApplicantsPage,
     Prediction,
     Recommendation,
     CreatedApplicant
@@ -30,7 +36,7 @@ class RecommendationService(ABC):
 
 class ApplicantRepository(ABC):
     @abstractmethod
-    async def bulk_upsert(self, applicants: list[ApplicantCreate]) -> None: pass
+    async def bulk_upsert(self, applicants: list[ApplicantCreate], commit: bool = True) -> BulkUpsertResult: pass
 
     @abstractmethod
     async def read(self, applicant_id: int) -> list[CreatedApplicant]: pass
@@ -41,6 +47,9 @@ class ApplicantRepository(ABC):
     @abstractmethod
     async def get_applicant(self, applicant_id: int, direction: str) -> Optional[CreatedApplicant]: pass
 
+    @abstractmethod
+    async def get_applicants_by_keys(self, keys: list[tuple[int, str]]) -> list[CreatedApplicant]: pass
+
     @abstractmethod
     async def get_applicants_by_direction(self, direction: str) -> list[CreatedApplicant]: pass
 
@@ -55,8 +64,80 @@ class ApplicantRepository(ABC):
             limit: int
     ) -> list[CreatedApplicant]: pass
 
+    @abstractmethod
+    async def read_rows(self, applicant_id: int) -> list[Row]:
+        """Строки абитуриента для ответа с ETag, читаются с primary вместе с версией"""
+        pass
+
+    @abstractmethod
+    async def get_rows_by_direction(self, direction: str) -> list[Row]:
+        """Конкурсный список для кеша и ответа с ETag, читается с primary вместе с версией"""
+        pass
+
+    @abstractmethod
+    async def lookup_rows(self, applicant_ids: list[int], keys: list[tuple[int, str]]) -> list[Row]:
+        """Строки абитуриентов по списку ID и по парам (ID, направление) одним запросом"""
+        pass
+
+    @abstractmethod
+    async def record_changes(self, keys: list[tuple[int, str]]) -> None:
+        """Записывает изменившихся абитуриентов в журнал в текущей транзакции"""
+        pass
+
+    @abstractmethod
+    async def get_change_log_bounds(self) -> tuple[int, int]:
+        """Минимальная и максимальная версии в журнале изменений, (0, 0) если журнал пуст"""
+        pass
+
+    @abstractmethod
+    async def get_direction_version(self, direction: str) -> int:
+        """Версия конкурсного списка направления по журналу изменений"""
+        pass
+
+    @abstractmethod
+    async def get_applicant_version(self, applicant_id: int) -> int:
+        """Отпечаток версий строк абитуриента по журналу изменений для ETag"""
+        pass
+
+    @abstractmethod
+    async def get_changes_since(self, direction: str, since: int) -> list[Row]:
+        """Текущие строки абитуриентов, изменившихся после версии since"""
+        pass
+
+    @abstractmethod
+    async def prune_changes(self, older_than: timedelta) -> int: pass
+
+    @abstractmethod
+    async def paginate_by_cursor(self, cursor: Optional[str], limit: int) -> ApplicantsPage: pass
+
+    @abstractmethod
+    async def paginate_by_direction_cursor(
+            self,
+            direction: str,
+            cursor: Optional[str],
+            limit: int
+    ) -> ApplicantsPage: pass
+
     @abstractmethod
     async def sort_by_probability(self, applicant_id: int) -> list[CreatedApplicant]: pass
 
     @abstractmethod
     async def count(self) -> int: pass
+
+
+class SnapshotRepository(ABC):
+    @abstractmethod
+    async def mark_processed(
+            self,
+            snapshot_id: str,
+            chunk_number: int,
+            is_last: bool,
+            directions: set[str]
+    ) -> Optional[set[str]]:
+        """Отмечает чанк обработанным. Если этим чанком снапшот завершён,
+        возвращает направления, изменившиеся во всём снапшоте, иначе None.
+        """
+        pass
+
+    @abstractmethod
+    async def prune(self, older_than: timedelta) -> int: pass
@@ -1,22 +1,58 @@
+from typing import Union
+
+from uuid import uuid4
+
 from faststream import Logger
-from faststream.rabbit import RabbitRouter
+from faststream.rabbit import RabbitQueue, RabbitRouter
 
 from dishka.integrations.base import FromDishka as Depends
 
-from .dto import ApplicantUpdateEvent
-from .use_cases import UpdateApplicantsUseCase
+from .dto import ApplicantUpdateEvent, ApplicantsChunk, ApplicantDeltasEvent
+from .ingest import SnapshotTracker, ApplicantsCoalescer
+from .cache import CompetitionListCache, ChangeLogVersions
+from .deltas import REPLICA_ID, DeltaHub, deltas_exchange
+
+from ..constants import APPLICANTS_QUEUE, APPLICANT_DELTAS_EXCHANGE
 
 
 applicants_router = RabbitRouter()
 
 
-@applicants_router.subscriber("applicants")
+@applicants_router.subscriber(APPLICANTS_QUEUE)
 async def update_applicants(
-        applicants: list[ApplicantUpdateEvent],
-        update_applicants_use_case: Depends[UpdateApplicantsUseCase],
+        message: Union[ApplicantsChunk, list[ApplicantUpdateEvent]],
+        applicants_coalescer: Depends[ApplicantsCoalescer],
+        snapshot_tracker: Depends[SnapshotTracker],
         logger: Logger
 ) -> None:
-    logger.info("Start update applicants")
-    logger.info(f"{applicants[0]}")
-    await update_applicants_use_case(applicants)
-    logger.info("Finished updating applicants")
+    # Сообщение подтверждается только после записи батча, в который оно попало
+    if isinstance(message, list):
+        # Старый формат: список абитуриентов одним сообщением, то есть снапшот из одного чанка
+        message = ApplicantsChunk(snapshot_id=uuid4().hex, chunk_number=1, is_last=True, applicants=message)
+    logger.info(f"Start update applicants, snapshot {message.snapshot_id} chunk {message.chunk_number}")
+    changed_directions = await applicants_coalescer.submit(message.applicants)
+    await snapshot_tracker.mark_processed(
+        message.snapshot_id,
+        message.chunk_number,
+        message.is_last,
+        changed_directions
+    )
+    logger.info(f"Finished updating applicants, snapshot {message.snapshot_id} chunk {message.chunk_number}")
+
+
+@applicants_router.subscriber(
+    RabbitQueue(f"{APPLICANT_DELTAS_EXCHANGE}.{REPLICA_ID}", exclusive=True, auto_delete=True),
+    deltas_exchange
+)
+async def broadcast_applicant_deltas(
+        event: ApplicantDeltasEvent,
+        delta_hub: Depends[DeltaHub],
+        competition_list_cache: Depends[CompetitionListCache],
+        change_log_versions: Depends[ChangeLogVersions]
+) -> None:
+    # Реплика, выполнившая загрузку, освободила кеш и раздала изменения сразу после коммита
+    if event.origin == delta_hub.replica_id:
+        return
+    competition_list_cache.invalidate(event.directions)
+    change_log_versions.invalidate((delta.applicant_id, delta.direction) for delta in event.deltas)
+    delta_hub.publish_local(event.deltas)
@@ -0,0 +1,165 @@
+from typing import Generic, NamedTuple, Optional, TypeVar
+
+import sys
+from collections.abc import Awaitable, Callable, Iterable
+
+from .dto import CompetitionListCacheStats
+
+from ..types import Row
+from ..cache import TTLCache
+from ..responses import dump_json
+from ..constants import (
+    COMPETITION_LIST_CACHE_MAXSIZE,
+    COMPETITION_LIST_CACHE_TTL,
+    VERSION_CACHE_MAXSIZE,
+    VERSION_CACHE_TTL
+)
+
+K = TypeVar("K")
+
+
+class CachedCompetitionList(NamedTuple):
+    """Готовый к отдаче конкурсный список направления"""
+    version: int  # Версия направления в журнале изменений, прочитанная до строк
+    institute: str
+    applicants: list[Row]
+    body: bytes  # Сериализованный JSON массива applicants
+    size: int  # Приблизительный размер в байтах
+    ranked: list[Row]  # Строки по возрастанию rank
+    positions: dict[int, int]  # applicant_id -> индекс в ranked
+    originals_above: list[int]  # Количество оригиналов строго выше каждого индекса ranked
+
+    def render(self, applicant_id: int, direction: str) -> bytes:
+        """Собирает JSON CompetitionList из готового массива без повторной сериализации"""
+        return b"".join((
+            b'{"applicant_id":', dump_json(applicant_id),
+            b',"institute":', dump_json(self.institute),
+            b',"direction":', dump_json(direction),
+            b',"applicants":', self.body,
+            b"}"
+        ))
+
+    def window(self, applicant_id: int, size: int) -> Optional[tuple[int, list[Row]]]:
+        """Возвращает индекс абитуриента в ranked и ±size строк вокруг него"""
+        position = self.positions.get(applicant_id)
+        if position is None:
+            return None
+        return position, self.ranked[max(position - size, 0):position + size + 1]
+
+
+class CompetitionListCache:
+    """Кеш конкурсных списков в памяти процесса по направлению и версии из журнала изменений.
+    Запись отдаётся, только если её версия совпадает с текущей версией направления из ChangeLogVersions,
+    поэтому реплики не отдают список старше версии. Инвалидация и TTL только освобождают память.
+    """
+    def __init__(
+            self,
+            maxsize: int = COMPETITION_LIST_CACHE_MAXSIZE,
+            ttl: float = COMPETITION_LIST_CACHE_TTL
+    ) -> None:
+        self._cache: TTLCache[str, CachedCompetitionList] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, direction: str, version: int) -> Optional[CachedCompetitionList]:
+        cached = self._cache.get(direction)
+        if cached is None or cached.version != version:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return cached
+
+    def set(self, direction: str, version: int, applicants: list[Row]) -> Optional[CachedCompetitionList]:
+        """Сохраняет список, если в кеше нет списка более новой версии"""
+        if not applicants:
+            return None
+        body = dump_json(applicants)
+        ranked = sorted(applicants, key=lambda applicant: applicant["rank"])
+        originals_above, originals = [], 0
+        for applicant in ranked:
+            originals_above.append(originals)
+            originals += applicant["original"]
+        cached = CachedCompetitionList(
+            version=version,
+            institute=applicants[0]["institute"],
+            applicants=applicants,
+            body=body,
+            size=len(body) + self._estimate_size(applicants),
+            ranked=ranked,
+            positions={applicant["applicant_id"]: position for position, applicant in enumerate(ranked)},
+            originals_above=originals_above
+        )
+        current = self._cache.get(direction)
+        if current is None or current.version <= version:
+            self._cache.set(direction, cached)
+        return cached
+
+    def invalidate(self, directions: Iterable[str]) -> None:
+        """Удаляет списки направлений, изменившихся в загрузке"""
+        for direction in set(directions):
+            self._cache.delete(direction)
+
+    def stats(self) -> CompetitionListCacheStats:
+        entries = self._cache.values()
+        requests = self._hits + self._misses
+        return CompetitionListCacheStats(
+            directions=len(entries),
+            applicants=sum(len(entry.applicants) for entry in entries),
+            memory_bytes=sum(entry.size for entry in entries),
+            hits=self._hits,
+            misses=self._misses,
+            hit_rate=self._hits / requests if requests else 0.0
+        )
+
+    @staticmethod
+    def _estimate_size(applicants: list[Row]) -> int:
+        size = sys.getsizeof(applicants)
+        for applicant in applicants:
+            size += sys.getsizeof(applicant) + sum(sys.getsizeof(value) for value in applicant.values())
+        return size
+
+
+class _Versions(Generic[K]):
+    """Версии по ключу с защитой от записи версии, прочитанной до инвалидации"""
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._cache: TTLCache[K, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+
+    async def get(self, key: K, load: Callable[[], Awaitable[int]]) -> int:
+        version = self._cache.get(key)
+        if version is not None:
+            return version
+        generation = self._generation
+        version = await load()
+        # Пока версия читалась из БД, загрузка могла её изменить: такую версию не кешируем
+        if generation == self._generation:
+            self._cache.set(key, version)
+        return version
+
+    def invalidate(self, keys: Iterable[K]) -> None:
+        self._generation += 1
+        for key in set(keys):
+            self._cache.delete(key)
+
+
+class ChangeLogVersions:
+    """Версии направлений и абитуриентов из журнала изменений для ETag в памяти процесса.
+    Загрузка удаляет версии изменившихся ключей на своей реплике после коммита, остальные реплики —
+    по событию изменений, поэтому условный GET отвечает 304 без запроса к БД.
+    При промахе версия читается из БД; если событие до реплики не дошло, версия устаревает не дольше TTL.
+    """
+    def __init__(self, maxsize: int = VERSION_CACHE_MAXSIZE, ttl: float = VERSION_CACHE_TTL) -> None:
+        self._directions: _Versions[str] = _Versions(maxsize=maxsize, ttl=ttl)
+        self._applicants: _Versions[int] = _Versions(maxsize=maxsize, ttl=ttl)
+
+    async def get_direction_version(self, direction: str, load: Callable[[], Awaitable[int]]) -> int:
+        return await self._directions.get(direction, load)
+
+    async def get_applicant_version(self, applicant_id: int, load: Callable[[], Awaitable[int]]) -> int:
+        return await self._applicants.get(applicant_id, load)
+
+    def invalidate(self, keys: Iterable[tuple[int, str]]) -> None:
+        """Удаляет версии абитуриентов и направлений, изменившихся в загрузке"""
+        keys = list(keys)
+        self._applicants.invalidate(applicant_id for applicant_id, _ in keys)
+        self._directions.invalidate(direction for _, direction in keys)
@@ -0,0 +1,257 @@
+from typing import Optional, TypeAlias
+
+import asyncio
+import logging
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .base import ClassifierService
+from .dto import ApplicantPredict, Prediction, PredictionsCacheStats
+from .exceptions import PredictionError, ClassifierUnavailableError
+
+from ..cache import TTLCache
+from ..constants import (
+    DEFAULT_CACHE_EXPIRE,
+    PREDICTIONS_CACHE_MAXSIZE,
+    PREDICTIONS_CACHE_PREFIX,
+    PREDICTIONS_CACHE_FLUSH_BATCH,
+    MIN_PREDICT_CHUNK_SIZE,
+    MAX_PREDICT_CHUNK_SIZE,
+    DEFAULT_PREDICT_CHUNK_SIZE,
+    PREDICT_MAX_CONCURRENCY,
+    PREDICT_TARGET_LATENCY,
+    PREDICT_MAX_RETRIES,
+    PREDICT_RETRY_BACKOFF
+)
+
+
+PredictKey: TypeAlias = tuple[int, str, float, int, str]
+
+
+def predict_key(applicant: ApplicantPredict) -> PredictKey:
+    """Ключ запроса к классификатору, одинаковые запросы дают одинаковый ключ"""
+    return applicant.year, applicant.gender, applicant.gpa, applicant.points, applicant.direction
+
+
+class ChunkedClassifier(ClassifierService):
+    """Делит predict_batch на чанки и отправляет их параллельно с ограничением конкурентности.
+    Размер чанка растёт, пока классификатор отвечает быстрее PREDICT_TARGET_LATENCY,
+    и уменьшается вдвое при таймаутах и ошибках 5xx. Упавший чанк повторяется отдельно.
+    """
+    def __init__(
+            self,
+            classifier_service: ClassifierService,
+            min_chunk_size: int = MIN_PREDICT_CHUNK_SIZE,
+            max_chunk_size: int = MAX_PREDICT_CHUNK_SIZE,
+            chunk_size: int = DEFAULT_PREDICT_CHUNK_SIZE,
+            max_concurrency: int = PREDICT_MAX_CONCURRENCY,
+            target_latency: float = PREDICT_TARGET_LATENCY,
+            max_retries: int = PREDICT_MAX_RETRIES
+    ) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._classifier_service = classifier_service
+        self._min_chunk_size = min_chunk_size
+        self._max_chunk_size = max_chunk_size
+        self._chunk_size = chunk_size
+        self._target_latency = target_latency
+        self._max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    async def predict(self, applicant: ApplicantPredict) -> Prediction:
+        return await self._classifier_service.predict(applicant)
+
+    async def predict_batch(self, applicants: list[ApplicantPredict]) -> list[Prediction]:
+        tasks: list[asyncio.Task[list[Prediction]]] = []
+        try:
+            start = 0
+            while start < len(applicants):
+                # Размер следующего чанка берётся после освобождения слота,
+                # чтобы учесть задержки уже обработанных чанков
+                await self._semaphore.acquire()
+                chunk = applicants[start:start + self._chunk_size]
+                start += len(chunk)
+                task = asyncio.create_task(self._dispatch(chunk))
+                # Слот освобождается по завершении задачи, даже если её отменили до первого шага
+                task.add_done_callback(self._release)
+                tasks.append(task)
+            chunks = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return [prediction for predictions in chunks for prediction in predictions]
+
+    async def _dispatch(self, chunk: list[ApplicantPredict]) -> list[Prediction]:
+        for attempt in range(self._max_retries + 1):
+            started_at = time.monotonic()
+            try:
+                predictions = await self._classifier_service.predict_batch(chunk)
+            except ClassifierUnavailableError:
+                self._shrink()
+                if attempt == self._max_retries:
+                    raise
+                self.logger.warning(f"Retrying chunk of {len(chunk)} applicants, attempt {attempt + 1}")
+                await asyncio.sleep(PREDICT_RETRY_BACKOFF * 2 ** attempt)
+                continue
+            if len(predictions) != len(chunk):
+                raise PredictionError(f"Expected {len(chunk)} predictions, got {len(predictions)}")
+            self._grow(len(chunk), time.monotonic() - started_at)
+            return predictions
+
+    def _release(self, task: asyncio.Task) -> None:
+        self._semaphore.release()
+
+    def _grow(self, size: int, latency: float) -> None:
+        if latency < self._target_latency and size >= self._chunk_size:
+            self._chunk_size = min(self._chunk_size * 2, self._max_chunk_size)
+
+    def _shrink(self) -> None:
+        self._chunk_size = max(self._chunk_size // 2, self._min_chunk_size)
+        self.logger.warning(f"Classifier is overloaded, chunk size decreased to {self._chunk_size}")
+
+
+class DeduplicatingClassifier(ClassifierService):
+    """Схлопывает одинаковые запросы внутри батча перед отправкой
+    и раскладывает предсказания обратно по исходным позициям.
+    """
+    def __init__(self, classifier_service: ClassifierService) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._classifier_service = classifier_service
+
+    async def predict(self, applicant: ApplicantPredict) -> Prediction:
+        return await self._classifier_service.predict(applicant)
+
+    async def predict_batch(self, applicants: list[ApplicantPredict]) -> list[Prediction]:
+        positions: dict[PredictKey, int] = {}
+        unique_applicants: list[ApplicantPredict] = []
+        indexes: list[int] = []
+        for applicant in applicants:
+            key = predict_key(applicant)
+            if key not in positions:
+                positions[key] = len(unique_applicants)
+                unique_applicants.append(applicant)
+            indexes.append(positions[key])
+        if applicants:
+            self.logger.info(
+                f"Deduplicated batch: {len(applicants)} -> {len(unique_applicants)} "
+                f"(ratio {1 - len(unique_applicants) / len(applicants):.2%})"
+            )
+        predictions = await self._classifier_service.predict_batch(unique_applicants)
+        return [predictions[index] for index in indexes]
+
+
+class CachingClassifier(ClassifierService):
+    """Мемоизация предсказаний: LRU+TTL кеш в памяти процесса и опционально Redis.
+    В классификатор отправляются только промахи.
+    """
+    def __init__(
+            self,
+            classifier_service: ClassifierService,
+            redis: Optional[Redis] = None,
+            model_version: str = "",
+            maxsize: int = PREDICTIONS_CACHE_MAXSIZE,
+            ttl: int = DEFAULT_CACHE_EXPIRE
+    ) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._classifier_service = classifier_service
+        self._redis = redis
+        self._model_version = model_version
+        self._ttl = ttl
+        self._local_cache: TTLCache[PredictKey, Prediction] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._local_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+
+    async def predict(self, applicant: ApplicantPredict) -> Prediction:
+        predictions = await self.predict_batch([applicant])
+        return predictions[0]
+
+    async def predict_batch(self, applicants: list[ApplicantPredict]) -> list[Prediction]:
+        keys = [predict_key(applicant) for applicant in applicants]
+        cached: dict[PredictKey, Prediction] = {}
+        missed: list[int] = []
+        for index, key in enumerate(keys):
+            prediction = cached.get(key) or self._local_cache.get(key)
+            if prediction is None:
+                missed.append(index)
+            else:
+                cached[key] = prediction
+        self._local_hits += len(keys) - len(missed)
+        if missed and self._redis is not None:
+            redis_cached = await self._get_from_redis([keys[index] for index in missed])
+            for key, prediction in redis_cached.items():
+                self._local_cache.set(key, prediction)
+            cached.update(redis_cached)
+            still_missed = [index for index in missed if keys[index] not in cached]
+            self._redis_hits += len(missed) - len(still_missed)
+            missed = still_missed
+        self._misses += len(missed)
+        if missed:
+            predictions = await self._classifier_service.predict_batch([applicants[index] for index in missed])
+            fresh = {keys[index]: prediction for index, prediction in zip(missed, predictions)}
+            for key, prediction in fresh.items():
+                self._local_cache.set(key, prediction)
+            await self._set_to_redis(fresh)
+            cached.update(fresh)
+        return [cached[key] for key in keys]
+
+    def stats(self) -> PredictionsCacheStats:
+        return PredictionsCacheStats(
+            model_version=self._model_version,
+            size=len(self._local_cache),
+            local_hits=self._local_hits,
+            redis_hits=self._redis_hits,
+            misses=self._misses
+        )
+
+    async def flush(self, model_version: Optional[str] = None) -> None:
+        """Очищает кеш, например после обновления модели классификатора"""
+        self._local_cache.clear()
+        if self._redis is not None:
+            try:
+                keys: list[bytes] = []
+                async for key in self._redis.scan_iter(match=f"{PREDICTIONS_CACHE_PREFIX}:*"):
+                    keys.append(key)
+                    if len(keys) >= PREDICTIONS_CACHE_FLUSH_BATCH:
+                        await self._redis.delete(*keys)
+                        keys.clear()
+                if keys:
+                    await self._redis.delete(*keys)
+            except RedisError as e:
+                self.logger.error(f"Error while flushing predictions from redis: {e}")
+        if model_version is not None:
+            self._model_version = model_version
+        self.logger.info(f"Predictions cache flushed, model version: {self._model_version!r}")
+
+    def _redis_key(self, key: PredictKey) -> str:
+        return ":".join(map(str, (PREDICTIONS_CACHE_PREFIX, self._model_version, *key)))
+
+    async def _get_from_redis(self, keys: list[PredictKey]) -> dict[PredictKey, Prediction]:
+        unique_keys = list(dict.fromkeys(keys))
+        try:
+            values = await self._redis.mget([self._redis_key(key) for key in unique_keys])
+        except RedisError as e:
+            self.logger.error(f"Error while reading predictions from redis: {e}")
+            return {}
+        return {
+            key: Prediction.model_validate_json(value)
+            for key, value in zip(unique_keys, values)
+            if value is not None
+        }
+
+    async def _set_to_redis(self, predictions: dict[PredictKey, Prediction]) -> None:
+        if self._redis is None or not predictions:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                for key, prediction in predictions.items():
+                    pipeline.set(self._redis_key(key), prediction.model_dump_json(), ex=self._ttl)
+                await pipeline.execute()
+        except RedisError as e:
+            self.logger.error(f"Error while writing predictions to redis: {e}")
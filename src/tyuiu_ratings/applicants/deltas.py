@@ -0,0 +1,132 @@
+from collections.abc import Iterable
+
+import asyncio
+import logging
+from uuid import uuid4
+
+from faststream.rabbit import ExchangeType, RabbitBroker, RabbitExchange
+
+from .dto import ApplicantDelta, ApplicantDeltasEvent
+
+from ..constants import (
+    APPLICANT_DELTAS_EXCHANGE,
+    DELTA_SUBSCRIPTION_QUEUE_SIZE,
+    DELTA_PUBLISH_RETRIES,
+    DELTA_PUBLISH_RETRY_DELAY
+)
+
+# ID реплики API, по нему реплика узнаёт свои же события из fanout обмена
+REPLICA_ID = uuid4().hex
+
+deltas_exchange = RabbitExchange(APPLICANT_DELTAS_EXCHANGE, type=ExchangeType.FANOUT)
+
+
+class DeltaSubscription:
+    """Подписка клиента на изменения направлений и абитуриентов.
+    Если клиент не успевает читать, старые пакеты отбрасываются.
+    """
+    def __init__(
+            self,
+            directions: Iterable[str],
+            applicant_ids: Iterable[int],
+            maxsize: int = DELTA_SUBSCRIPTION_QUEUE_SIZE
+    ) -> None:
+        self.directions = frozenset(directions)
+        self.applicant_ids = frozenset(applicant_ids)
+        self.dropped = 0  # Количество отброшенных пакетов
+        self._queue: asyncio.Queue[list[ApplicantDelta]] = asyncio.Queue(maxsize=maxsize)
+
+    def put(self, deltas: list[ApplicantDelta]) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(deltas)
+
+    async def get(self) -> list[ApplicantDelta]:
+        return await self._queue.get()
+
+
+class DeltaHub:
+    """Локальный pub/sub изменений конкурсных списков.
+    Между репликами изменения передаются через fanout обмен RabbitMQ,
+    внутри процесса раздаются подписчикам по направлениям и ID абитуриентов.
+    """
+    def __init__(
+            self,
+            broker: RabbitBroker,
+            replica_id: str = REPLICA_ID,
+            max_retries: int = DELTA_PUBLISH_RETRIES,
+            retry_delay: float = DELTA_PUBLISH_RETRY_DELAY
+    ) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.replica_id = replica_id
+        self._broker = broker
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+        self._retry_tasks: set[asyncio.Task[None]] = set()
+        self._by_direction: dict[str, set[DeltaSubscription]] = {}
+        self._by_applicant_id: dict[int, set[DeltaSubscription]] = {}
+
+    def subscribe(self, directions: Iterable[str], applicant_ids: Iterable[int]) -> DeltaSubscription:
+        subscription = DeltaSubscription(directions, applicant_ids)
+        for direction in subscription.directions:
+            self._by_direction.setdefault(direction, set()).add(subscription)
+        for applicant_id in subscription.applicant_ids:
+            self._by_applicant_id.setdefault(applicant_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: DeltaSubscription) -> None:
+        for direction in subscription.directions:
+            subscriptions = self._by_direction.get(direction, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._by_direction.pop(direction, None)
+        for applicant_id in subscription.applicant_ids:
+            subscriptions = self._by_applicant_id.get(applicant_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._by_applicant_id.pop(applicant_id, None)
+
+    @property
+    def subscribers(self) -> int:
+        subscriptions = set().union(*self._by_direction.values(), *self._by_applicant_id.values())
+        return len(subscriptions)
+
+    def publish_local(self, deltas: list[ApplicantDelta]) -> None:
+        """Раздаёт каждому подписчику только интересующие его изменения"""
+        matched: dict[DeltaSubscription, list[ApplicantDelta]] = {}
+        for delta in deltas:
+            subscriptions = (
+                self._by_direction.get(delta.direction, set())
+                | self._by_applicant_id.get(delta.applicant_id, set())
+            )
+            for subscription in subscriptions:
+                matched.setdefault(subscription, []).append(delta)
+        for subscription, subscription_deltas in matched.items():
+            subscription.put(subscription_deltas)
+
+    async def publish(self, deltas: list[ApplicantDelta], directions: Iterable[str] = ()) -> None:
+        """Раздаёт изменения локальным подписчикам и рассылает событие загрузки остальным репликам.
+        Событие отправляется даже без изменений, при недоступности брокера отправка повторяется в фоне.
+        """
+        self.publish_local(deltas)
+        event = ApplicantDeltasEvent(origin=self.replica_id, deltas=deltas, directions=sorted(set(directions)))
+        try:
+            await self._broker.publish(event, exchange=deltas_exchange)
+        except Exception as e:
+            self.logger.warning(f"Error while publishing applicant deltas, will retry: {e}")
+            task = asyncio.create_task(self._retry(event))
+            self._retry_tasks.add(task)
+            task.add_done_callback(self._retry_tasks.discard)
+
+    async def _retry(self, event: ApplicantDeltasEvent) -> None:
+        delay = self._retry_delay
+        for attempt in range(1, self._max_retries + 1):
+            await asyncio.sleep(delay)
+            try:
+                await self._broker.publish(event, exchange=deltas_exchange)
+                return
+            except Exception as e:
+                self.logger.warning(f"Retry {attempt} of publishing applicant deltas failed: {e}")
+            delay *= 2
+        self.logger.error(f"Applicant deltas were not published after {self._max_retries} retries")
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 
 from datetime import datetime
 
@@ -7,7 +7,7 @@ from pydantic import BaseModel, Field, field_validator, ConfigDict
 from .schemas import Applicant
 
 from ..types import ExamList
-from ..utils import mapping_direction
+from ..directions.mapping import directions_mapper
 from ..constants import (
     PREDICTED_YEAR,
     DEFAULT_GPA,
@@ -15,7 +15,8 @@ from ..constants import (
     MIN_POINTS,
     MAX_POINTS,
     MIN_GPA,
-    MAX_GPA
+    MAX_GPA,
+    MAX_BATCH_LOOKUP_SIZE
 )
 
 
@@ -23,7 +24,17 @@ class ApplicantUpdateEvent(Applicant):
     """Событие на создание/обновление абитуриента в конкурсном списке."""
     @field_validator("direction")
     def validate_direction(cls, direction: str) -> str:
-        return mapping_direction(direction)
+        return directions_mapper.map(direction)
+
+
+class ApplicantsChunk(BaseModel):
+    """Часть снапшота конкурсного списка.
+    Чанки нумеруются с 1, у последнего чанка снапшота is_last=True.
+    """
+    snapshot_id: str
+    chunk_number: int = Field(ge=1)
+    is_last: bool = False
+    applicants: list[ApplicantUpdateEvent]
 
 
 class ApplicantCreate(Applicant):
@@ -31,6 +42,12 @@ class ApplicantCreate(Applicant):
     probability: float  # Вероятность поступления
 
 
+class BulkUpsertResult(BaseModel):
+    """Результат массовой записи абитуриентов"""
+    inserted: int = 0  # Количество добавленных строк
+    updated: int = 0  # Количество обновлённых строк
+
+
 class CreatedApplicant(Applicant):
     """Абитуриент из базы данных (уже созданный)"""
     probability: float
@@ -38,6 +55,12 @@ class CreatedApplicant(Applicant):
     updated_at: datetime
 
 
+class ApplicantsPage(BaseModel):
+    """Страница keyset-пагинации"""
+    applicants: list[CreatedApplicant]
+    next_cursor: Optional[str] = None  # Токен следующей страницы, None если страница последняя
+
+
 class ApplicantPredict(BaseModel):
     """Схема запроса для получения вероятности поступления"""
     year: int = PREDICTED_YEAR
@@ -63,6 +86,25 @@ class Prediction(BaseModel):
     probability: float
 
 
+class PredictionsCacheStats(BaseModel):
+    """Статистика кеша предсказаний"""
+    model_version: str
+    size: int  # Количество записей в памяти процесса
+    local_hits: int
+    redis_hits: int
+    misses: int
+
+
+class CompetitionListCacheStats(BaseModel):
+    """Статистика кеша конкурсных списков"""
+    directions: int  # Количество закешированных направлений
+    applicants: int
+    memory_bytes: int  # Приблизительный объём памяти
+    hits: int
+    misses: int
+    hit_rate: float
+
+
 class Recommendation(BaseModel):
     direction_id: int
     direction: str
@@ -89,3 +131,64 @@ class CompetitionList(BaseModel):
     institute: str
     direction: str
     applicants: list[CreatedApplicant]
+
+
+class CompetitionWindow(BaseModel):
+    """Окно конкурсного списка вокруг позиции абитуриента"""
+    applicant_id: int
+    institute: str
+    direction: str
+    rank: int
+    total: int  # Всего абитуриентов на направлении
+    originals_above: int  # Абитуриентов с оригиналами выше по рейтингу
+    budget_places: Optional[int] = None
+    budget_gap: Optional[int] = None  # Позиций до проходной черты, <= 0 если в пределах бюджетных мест
+    applicants: list[CreatedApplicant]
+
+
+class ApplicantKey(BaseModel):
+    """Ключ абитуриента на направлении"""
+    applicant_id: int
+    direction: str
+
+
+class ApplicantsBatchRequest(BaseModel):
+    """Пакетный запрос абитуриентов по ID и по парам (ID, направление)"""
+    applicant_ids: list[int] = Field(default_factory=list, max_length=MAX_BATCH_LOOKUP_SIZE)
+    keys: list[ApplicantKey] = Field(default_factory=list, max_length=MAX_BATCH_LOOKUP_SIZE)
+
+
+class ApplicantLookup(ApplicantKey):
+    """Результат поиска по ключу, applicant=None если абитуриент не найден"""
+    applicant: Optional[CreatedApplicant] = None
+
+
+class ApplicantsBatch(BaseModel):
+    """Ответ на пакетный запрос, сгруппированный по ключам запроса"""
+    applicants: dict[int, list[CreatedApplicant]]  # applicant_id -> направления по убыванию приоритета
+    keys: list[ApplicantLookup]  # В порядке ключей запроса
+
+
+class ApplicantDelta(BaseModel):
+    """Изменение абитуриента в конкурсном списке после загрузки"""
+    applicant_id: int
+    direction: str
+    rank: int
+    probability: float
+    original: bool
+
+
+class ApplicantDeltasEvent(BaseModel):
+    """Изменения одной загрузки, рассылаются всем репликам API даже без изменений"""
+    origin: str  # ID реплики, выполнившей загрузку
+    deltas: list[ApplicantDelta]
+    directions: list[str] = Field(default_factory=list)  # Направления, чьи списки изменились
+
+
+class CompetitionListDelta(BaseModel):
+    """Изменения конкурсного списка с версии since"""
+    applicant_id: int
+    direction: str
+    version: int  # Версия журнала изменений, передаётся в since следующего запроса
+    full: bool  # True, если журнал не покрывает since и отдан весь список
+    applicants: list[CreatedApplicant]  # Добавленные и изменённые абитуриенты
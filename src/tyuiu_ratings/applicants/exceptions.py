@@ -4,6 +4,10 @@ class PredictionError(Exception):
     pass
 
 
+class ClassifierUnavailableError(PredictionError):
+    pass
+
+
 class RecommendationError(Exception):
     pass
 
@@ -16,9 +20,17 @@ class ApplicantsReadingError(Exception):
     pass
 
 
+class InvalidCursorError(ApplicantsReadingError):
+    pass
+
+
 class UseCaseError(Exception):
     pass
 
 
 class DirectionsRecommendationError(UseCaseError):
     pass
+
+
+class SnapshotTrackingError(Exception):
+    pass
@@ -0,0 +1,159 @@
+from typing import Optional
+from collections.abc import Awaitable, Callable
+
+import asyncio
+import logging
+
+from dishka import AsyncContainer, Scope
+
+from .base import SnapshotRepository
+from .dto import ApplicantUpdateEvent
+from .cache import CompetitionListCache
+from .deltas import DeltaHub
+from .use_cases import UpdateApplicantsUseCase
+
+from ..constants import (
+    COALESCE_MAX_BATCH_SIZE,
+    COALESCE_MAX_DELAY,
+    DEFAULT_RABBIT_CONSUMER_CONCURRENCY
+)
+
+
+# Хук завершения снапшота: ID снапшота и направления, чьи списки в нём изменились
+SnapshotHook = Callable[[str, set[str]], Awaitable[None]]
+
+
+class SnapshotTracker:
+    """Отслеживает обработанные чанки снапшотов конкурсного списка в БД
+    и запускает хуки, когда обработан последний из них.
+    Чанки одного снапшота могут обрабатываться разными консьюмерами и репликами.
+    """
+    def __init__(self, container: AsyncContainer) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._container = container
+        self._hooks: list[SnapshotHook] = []
+
+    def add_hook(self, hook: SnapshotHook) -> None:
+        self._hooks.append(hook)
+
+    async def mark_processed(
+            self,
+            snapshot_id: str,
+            chunk_number: int,
+            is_last: bool,
+            directions: set[str]
+    ) -> bool:
+        """Отмечает чанк обработанным, возвращает True, если этим чанком снапшот загружен полностью"""
+        async with self._container(scope=Scope.REQUEST) as request_container:
+            snapshot_repository = await request_container.get(SnapshotRepository)
+            changed_directions = await snapshot_repository.mark_processed(
+                snapshot_id,
+                chunk_number,
+                is_last,
+                directions
+            )
+        if changed_directions is None:
+            return False
+        self.logger.info(f"Snapshot {snapshot_id} completed, {len(changed_directions)} directions changed")
+        for hook in self._hooks:
+            try:
+                await hook(snapshot_id, changed_directions)
+            except Exception as e:
+                self.logger.error(f"Error in snapshot hook {hook!r}: {e}")
+        return True
+
+
+class DirectionStatsRefreshHook:
+    """Пересчитывает статистику направлений, изменившихся в снапшоте"""
+    def __init__(self, container: AsyncContainer) -> None:
+        self._container = container
+
+    async def __call__(self, snapshot_id: str, directions: set[str]) -> None:
+        from ..directions.base import DirectionStatsRepository
+        if not directions:
+            return
+        async with self._container(scope=Scope.REQUEST) as request_container:
+            direction_stats_repository = await request_container.get(DirectionStatsRepository)
+            await direction_stats_repository.refresh(list(directions))
+
+
+class CompetitionListInvalidationHook:
+    """Освобождает на всех репликах кеш списков, которые снапшот заменил,
+    включая закешированные по промежуточным версиям во время загрузки.
+    """
+    def __init__(self, competition_list_cache: CompetitionListCache, delta_hub: DeltaHub) -> None:
+        self._competition_list_cache = competition_list_cache
+        self._delta_hub = delta_hub
+
+    async def __call__(self, snapshot_id: str, directions: set[str]) -> None:
+        if not directions:
+            return
+        self._competition_list_cache.invalidate(directions)
+        await self._delta_hub.publish([], directions)
+
+
+class ApplicantsCoalescer:
+    """Объединяет события из небольших сообщений в один батч (по размеру или по времени)
+    и обрабатывает его одним вызовом UpdateApplicantsUseCase.
+    submit завершается только после фиксации батча, поэтому сообщение подтверждается после записи в БД.
+    """
+    def __init__(
+            self,
+            container: AsyncContainer,
+            max_batch_size: int = COALESCE_MAX_BATCH_SIZE,
+            max_delay: float = COALESCE_MAX_DELAY,
+            max_concurrent_batches: int = DEFAULT_RABBIT_CONSUMER_CONCURRENCY
+    ) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._container = container
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._semaphore = asyncio.Semaphore(max_concurrent_batches)
+        self._buffer: list[ApplicantUpdateEvent] = []
+        self._waiters: list[asyncio.Future[set[str]]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, applicants: list[ApplicantUpdateEvent]) -> set[str]:
+        """Возвращает направления абитуриентов сообщения, чьи списки изменились в батче"""
+        waiter: asyncio.Future[set[str]] = asyncio.get_running_loop().create_future()
+        self._buffer.extend(applicants)
+        self._waiters.append(waiter)
+        if len(self._buffer) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._max_delay, self._flush)
+        changed_directions = await waiter
+        return changed_directions & {applicant.direction for applicant in applicants}
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._waiters:
+            return
+        buffer, waiters = self._buffer, self._waiters
+        self._buffer, self._waiters = [], []
+        task = asyncio.create_task(self._process(buffer, waiters))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _process(
+            self,
+            applicants: list[ApplicantUpdateEvent],
+            waiters: list[asyncio.Future[set[str]]]
+    ) -> None:
+        try:
+            async with self._semaphore, self._container(scope=Scope.REQUEST) as request_container:
+                update_applicants_use_case = await request_container.get(UpdateApplicantsUseCase)
+                changed_directions = await update_applicants_use_case(applicants)
+        except Exception as e:
+            self.logger.error(f"Error while processing batch of {len(waiters)} messages: {e}")
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+        self.logger.info(f"Processed batch of {len(applicants)} applicants from {len(waiters)} messages")
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(changed_directions)
@@ -1,4 +1,9 @@
-from sqlalchemy import CheckConstraint, UniqueConstraint
+from typing import Optional
+
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, UniqueConstraint, Index, ForeignKey, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..database import Base
@@ -20,6 +25,11 @@ class ApplicantOrm(Base):
 
     __table_args__ = (
         UniqueConstraint("applicant_id", "direction", name="unique_applicant_direction"),
+        # Конкурсный список и keyset-пагинация по направлению
+        Index("ix_applicants_direction_rank_id", "direction", "rank", "id"),
+        # Направления абитуриента по приоритету и по вероятности поступления
+        Index("ix_applicants_applicant_id_priority", "applicant_id", "priority"),
+        Index("ix_applicants_applicant_id_probability", "applicant_id", "probability"),
         CheckConstraint(
             f"points BETWEEN {MIN_POINTS} AND {MAX_POINTS}",
             "check_points_range"
@@ -29,3 +39,42 @@ class ApplicantOrm(Base):
             "check_bonus_points_range"
         ),
     )
+
+
+class ApplicantChangeOrm(Base):
+    """Журнал изменений конкурсных списков, id служит версией для дельта-синхронизации"""
+    __tablename__ = "applicant_changes"
+
+    applicant_id: Mapped[int] = mapped_column(nullable=False)
+    direction: Mapped[str] = mapped_column(nullable=False)
+
+    __table_args__ = (
+        Index("ix_applicant_changes_direction_id", "direction", "id"),
+        # Версия строк абитуриента для ETag
+        Index("ix_applicant_changes_applicant_id_id", "applicant_id", "id"),
+    )
+
+
+class SnapshotOrm(Base):
+    """Снапшот конкурсного списка, который загружается чанками из разных сообщений"""
+    __tablename__ = "snapshots"
+
+    snapshot_id: Mapped[str] = mapped_column(unique=True, nullable=False)
+    total_chunks: Mapped[Optional[int]]  # Известно после получения последнего чанка
+    completed_at: Mapped[Optional[datetime]]  # Когда обработан последний недостающий чанк
+
+
+class SnapshotChunkOrm(Base):
+    """Обработанный чанк снапшота"""
+    __tablename__ = "snapshot_chunks"
+
+    snapshot_id: Mapped[str] = mapped_column(
+        ForeignKey("snapshots.snapshot_id", ondelete="CASCADE"),
+        nullable=False
+    )
+    chunk_number: Mapped[int] = mapped_column(nullable=False)
+    directions: Mapped[list[str]] = mapped_column(ARRAY(String))  # Направления, чьи списки изменились в чанке
+
+    __table_args__ = (
+        UniqueConstraint("snapshot_id", "chunk_number", name="unique_snapshot_chunk"),
+    )
@@ -1,41 +1,132 @@
 from typing import Optional, TYPE_CHECKING
 
+from datetime import timedelta
+
 if TYPE_CHECKING:
     from ..profiles.schemas import Profile
 
-from sqlalchemy import select, func
-from sqlalchemy.dialects.postgresql import insert
+from asyncpg import PostgresError
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    String,
+    select,
+    update,
+    func,
+    table,
+    column,
+    literal,
+    literal_column,
+    tuple_,
+    any_,
+    union,
+    delete,
+    distinct,
+    cast,
+    ScalarSelect
+)
+from sqlalchemy.dialects.postgresql import ARRAY, Insert, aggregate_order_by, insert
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .models import ApplicantOrm
-from .base import ApplicantRepository
-from .dto import CreatedApplicant, ApplicantCreate
-from .exceptions import ApplicantsCreationError, ApplicantsReadingError
+from .models import ApplicantOrm, ApplicantChangeOrm, SnapshotOrm, SnapshotChunkOrm
+from .base import ApplicantRepository, SnapshotRepository
+from .dto import CreatedApplicant, ApplicantCreate, ApplicantsPage, BulkUpsertResult
+from .exceptions import ApplicantsCreationError, ApplicantsReadingError, InvalidCursorError, SnapshotTrackingError
+
+from ..types import Row
+from ..database import copy_to_staging_table
+from ..utils import encode_cursor, decode_cursor
+from ..constants import BULK_UPSERT_CHUNK_SIZE, COPY_THRESHOLD, CHANGE_LOG_LOCK_ID
+
+
+# Колонки, которые заполняются при записи абитуриента:
+APPLICANT_COLUMNS = tuple(ApplicantCreate.model_fields)
+# Колонки из ограничения unique_applicant_direction:
+CONFLICT_COLUMNS = ("applicant_id", "direction")
+# Колонки ответа в порядке полей CreatedApplicant:
+CREATED_APPLICANT_COLUMNS = tuple(ApplicantOrm.__table__.c[name] for name in CreatedApplicant.model_fields)
 
 
 class SQLApplicantRepository(ApplicantRepository):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None) -> None:
         self.session = session
+        self.read_session = read_session or session
 
-    async def bulk_upsert(self, applicants: list[ApplicantCreate]) -> None:
+    async def bulk_upsert(self, applicants: list[ApplicantCreate], commit: bool = True) -> BulkUpsertResult:
+        rows = self._deduplicate(applicants)
         try:
-            for applicant in applicants:
-                stmt = (
-                    insert(ApplicantOrm)
-                    .values(**applicant.model_dump())
-                    .on_conflict_do_update(
-                        constraint="unique_applicant_direction",
-                        set_=applicant.model_dump()
-                    )
-                )
-                await self.session.execute(stmt)
-            await self.session.commit()
-        except SQLAlchemyError as e:
+            if len(rows) >= COPY_THRESHOLD:
+                result = await self._copy_upsert(rows)
+            else:
+                result = await self._chunked_upsert(rows)
+            if commit:
+                await self.session.commit()
+            return result
+        except (SQLAlchemyError, PostgresError) as e:
             await self.session.rollback()
             raise ApplicantsCreationError(f"Error while bulk creating: {e}") from e
 
+    @staticmethod
+    def _deduplicate(applicants: list[ApplicantCreate]) -> list[dict]:
+        """Оставляет последнюю запись для каждой пары (applicant_id, direction),
+        как это происходило при построчной вставке.
+        """
+        rows: dict[tuple[int, str], dict] = {}
+        for applicant in applicants:
+            row = applicant.model_dump()
+            rows[(row["applicant_id"], row["direction"])] = row
+        return list(rows.values())
+
+    async def _chunked_upsert(self, rows: list[dict]) -> BulkUpsertResult:
+        """Многострочные INSERT ... ON CONFLICT пачками по BULK_UPSERT_CHUNK_SIZE"""
+        result = BulkUpsertResult()
+        for start in range(0, len(rows), BULK_UPSERT_CHUNK_SIZE):
+            stmt = insert(ApplicantOrm).values(rows[start:start + BULK_UPSERT_CHUNK_SIZE])
+            chunk_result = await self._merge(stmt)
+            result.inserted += chunk_result.inserted
+            result.updated += chunk_result.updated
+        return result
+
+    async def _copy_upsert(self, rows: list[dict]) -> BulkUpsertResult:
+        """COPY во временную таблицу и слияние одним INSERT ... SELECT"""
+        staging_table = await copy_to_staging_table(
+            session=self.session,
+            table_name=ApplicantOrm.__tablename__,
+            columns=APPLICANT_COLUMNS,
+            records=(tuple(row[name] for name in APPLICANT_COLUMNS) for row in rows)
+        )
+        staging = table(staging_table, *(column(name) for name in APPLICANT_COLUMNS))
+        stmt = insert(ApplicantOrm).from_select(APPLICANT_COLUMNS, select(staging))
+        return await self._merge(stmt)
+
+    async def _merge(self, stmt: Insert) -> BulkUpsertResult:
+        """Выполняет upsert по unique_applicant_direction и считает добавленные/обновлённые строки"""
+        merged = (
+            stmt.on_conflict_do_update(
+                constraint="unique_applicant_direction",
+                set_={
+                    **{
+                        name: stmt.excluded[name]
+                        for name in APPLICANT_COLUMNS
+                        if name not in CONFLICT_COLUMNS
+                    },
+                    "updated_at": func.now()
+                }
+            )
+            # xmax = 0 только у строк, которые были вставлены, а не обновлены
+            .returning(literal_column("(xmax = 0)", Boolean).label("inserted"))
+            .cte("merged")
+        )
+        stmt = select(
+            func.count().filter(merged.c.inserted),
+            func.count().filter(~merged.c.inserted)
+        )
+        result = await self.session.execute(stmt)
+        inserted, updated = result.one()
+        return BulkUpsertResult(inserted=inserted, updated=updated)
+
     async def read(self, applicant_id: int) -> list[CreatedApplicant]:
         try:
             stmt = (
@@ -43,11 +134,11 @@ class SQLApplicantRepository(ApplicantRepository):
                 .where(ApplicantOrm.applicant_id == applicant_id)
                 .order_by(ApplicantOrm.priority.desc())
             )
-            results = await self.session.execute(stmt)
+            results = await self.read_session.execute(stmt)
             applicants = results.scalars().all()
             return [CreatedApplicant.model_validate(applicant) for applicant in applicants]
         except SQLAlchemyError as e:
-            await self.session.rollback()
+            await self.read_session.rollback()
             raise ApplicantsReadingError(f"Error while reading by applicant id: {e}") from e
 
     async def get_profile(self, applicant_id: int) -> Optional["Profile"]:
@@ -59,11 +150,11 @@ class SQLApplicantRepository(ApplicantRepository):
                 .where(ProfileOrm.applicant_id == applicant_id)
                 .options(selectinload(ProfileOrm.exams))
             )
-            result = await self.session.execute(stmt)
+            result = await self.read_session.execute(stmt)
             profile = result.scalars().first()
             return Profile.model_validate(profile) if profile else None
         except SQLAlchemyError as e:
-            await self.session.rollback()
+            await self.read_session.rollback()
             raise ApplicantsReadingError(f"Error while reading profiles: {e}") from e
 
     async def get_applicant(self, applicant_id: int, direction: str) -> Optional[CreatedApplicant]:
@@ -75,13 +166,46 @@ class SQLApplicantRepository(ApplicantRepository):
                     ApplicantOrm.direction == direction
                 )
             )
-            result = await self.session.execute(stmt)
+            result = await self.read_session.execute(stmt)
             applicant = result.scalar_one_or_none()
             return CreatedApplicant.model_validate(applicant) if applicant else None
         except SQLAlchemyError as e:
-            await self.session.commit()
+            await self.read_session.commit()
             raise ApplicantsReadingError(f"Error while reading applicant: {e}") from e
 
+    @staticmethod
+    def _keys_table(keys: list[tuple[int, str]]):
+        """Пары (ID, направление) как таблица из unnest двух массивов"""
+        applicant_ids, directions = zip(*keys)
+        return (
+            func.unnest(
+                literal(list(applicant_ids), ARRAY(Integer)),
+                literal(list(directions), ARRAY(String))
+            )
+            .table_valued("applicant_id", "direction")
+            .render_derived(name="keys")
+        )
+
+    async def get_applicants_by_keys(self, keys: list[tuple[int, str]]) -> list[CreatedApplicant]:
+        if not keys:
+            return []
+        keys_table = self._keys_table(keys)
+        try:
+            stmt = (
+                select(ApplicantOrm)
+                .join(
+                    keys_table,
+                    (ApplicantOrm.applicant_id == keys_table.c.applicant_id)
+                    & (ApplicantOrm.direction == keys_table.c.direction)
+                )
+            )
+            results = await self.session.execute(stmt)
+            applicants = results.scalars().all()
+            return [CreatedApplicant.model_validate(applicant) for applicant in applicants]
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ApplicantsReadingError(f"Error while reading by keys: {e}") from e
+
     async def get_applicants_by_direction(self, direction: str) -> list[CreatedApplicant]:
         try:
             stmt = (
@@ -89,26 +213,204 @@ class SQLApplicantRepository(ApplicantRepository):
                 .where(ApplicantOrm.direction == direction)
                 .order_by(ApplicantOrm.rank.desc())
             )
-            results = await self.session.execute(stmt)
+            results = await self.read_session.execute(stmt)
             applicants = results.scalars().all()
             return [CreatedApplicant.model_validate(applicant) for applicant in applicants]
+        except SQLAlchemyError as e:
+            await self.read_session.rollback()
+            raise ApplicantsReadingError(f"Error while reading by direction: {e}") from e
+
+    async def read_rows(self, applicant_id: int) -> list[Row]:
+        try:
+            stmt = (
+                select(*CREATED_APPLICANT_COLUMNS)
+                .where(ApplicantOrm.applicant_id == applicant_id)
+                .order_by(ApplicantOrm.priority.desc())
+            )
+            results = await self.session.execute(stmt)
+            return [dict(row) for row in results.mappings()]
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ApplicantsReadingError(f"Error while reading by applicant id: {e}") from e
+
+    async def get_rows_by_direction(self, direction: str) -> list[Row]:
+        try:
+            stmt = (
+                select(*CREATED_APPLICANT_COLUMNS)
+                .where(ApplicantOrm.direction == direction)
+                .order_by(ApplicantOrm.rank.desc())
+            )
+            results = await self.session.execute(stmt)
+            return [dict(row) for row in results.mappings()]
         except SQLAlchemyError as e:
             await self.session.rollback()
             raise ApplicantsReadingError(f"Error while reading by direction: {e}") from e
 
+    async def lookup_rows(self, applicant_ids: list[int], keys: list[tuple[int, str]]) -> list[Row]:
+        selects = []
+        if applicant_ids:
+            selects.append(
+                select(*CREATED_APPLICANT_COLUMNS)
+                .where(ApplicantOrm.applicant_id == any_(literal(list(set(applicant_ids)), ARRAY(Integer))))
+            )
+        if keys:
+            keys_table = self._keys_table(keys)
+            selects.append(
+                select(*CREATED_APPLICANT_COLUMNS)
+                .join(
+                    keys_table,
+                    (ApplicantOrm.applicant_id == keys_table.c.applicant_id)
+                    & (ApplicantOrm.direction == keys_table.c.direction)
+                )
+            )
+        if not selects:
+            return []
+        stmt = selects[0] if len(selects) == 1 else union(*selects)
+        stmt = stmt.order_by(literal_column("applicant_id"), literal_column("priority").desc())
+        try:
+            results = await self.read_session.execute(stmt)
+            return [dict(row) for row in results.mappings()]
+        except SQLAlchemyError as e:
+            await self.read_session.rollback()
+            raise ApplicantsReadingError(f"Error while batch lookup: {e}") from e
+
+    async def record_changes(self, keys: list[tuple[int, str]]) -> None:
+        if not keys:
+            return
+        try:
+            # Версии направления выдаются под его блокировкой до конца транзакции, поэтому в пределах
+            # направления коммитятся по возрастанию: клиент, получивший версию N, не пропустит меньшие.
+            # Чанки разных направлений коммитятся параллельно, блокировки берутся в порядке ключа
+            directions = (
+                func.unnest(literal(sorted({direction for _, direction in keys}), ARRAY(String)))
+                .table_valued("direction")
+                .render_derived(name="directions")
+            )
+            lock_keys = (
+                select(distinct(func.hashtext(directions.c.direction)).label("lock_key"))
+                .order_by("lock_key")
+                .subquery("lock_keys")
+            )
+            await self.session.execute(
+                select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK_ID, lock_keys.c.lock_key))
+            )
+            await self.session.execute(
+                insert(ApplicantChangeOrm),
+                [{"applicant_id": applicant_id, "direction": direction} for applicant_id, direction in keys]
+            )
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ApplicantsCreationError(f"Error while recording changes: {e}") from e
+
+    async def get_change_log_bounds(self) -> tuple[int, int]:
+        try:
+            stmt = select(
+                func.coalesce(func.min(ApplicantChangeOrm.id), 0),
+                func.coalesce(func.max(ApplicantChangeOrm.id), 0)
+            )
+            result = await self.session.execute(stmt)
+            min_version, max_version = result.one()
+            return min_version, max_version
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ApplicantsReadingError(f"Error while reading change log: {e}") from e
+
+    async def get_applicant_version(self, applicant_id: int) -> int:
+        """Версии направлений растут независимо, и max(id) абитуриента может не измениться после
+        коммита меньшей версии по другому направлению. Поэтому версией служит хеш последних версий
+        абитуриента по каждому направлению.
+        """
+        last_versions = (
+            select(ApplicantChangeOrm.direction, func.max(ApplicantChangeOrm.id).label("version"))
+            .where(ApplicantChangeOrm.applicant_id == applicant_id)
+            .group_by(ApplicantChangeOrm.direction)
+            .subquery("last_versions")
+        )
+        versions = func.string_agg(
+            last_versions.c.direction + ":" + cast(last_versions.c.version, String),
+            aggregate_order_by(literal(","), last_versions.c.direction)
+        )
+        return await self._get_version(select(func.hashtextextended(versions, 0)).scalar_subquery())
+
+    async def get_direction_version(self, direction: str) -> int:
+        last_version = (
+            select(func.max(ApplicantChangeOrm.id))
+            .where(ApplicantChangeOrm.direction == direction)
+            .scalar_subquery()
+        )
+        return await self._get_version(last_version)
+
+    async def _get_version(self, last_version: ScalarSelect[int]) -> int:
+        """Версия по последним записям журнала. Если записи уже очищены,
+        версией служит граница очистки: она не меньше очищенных версий и меньше будущих.
+        """
+        pruned_version = select(func.min(ApplicantChangeOrm.id) - 1).scalar_subquery()
+        try:
+            result = await self.session.execute(select(func.coalesce(last_version, pruned_version, 0)))
+            return result.scalar_one()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ApplicantsReadingError(f"Error while reading version: {e}") from e
+
+    async def get_changes_since(self, direction: str, since: int) -> list[Row]:
+        changed = (
+            select(distinct(ApplicantChangeOrm.applicant_id).label("applicant_id"))
+            .where(
+                ApplicantChangeOrm.direction == direction,
+                ApplicantChangeOrm.id > since
+            )
+            .subquery()
+        )
+        stmt = (
+            select(*CREATED_APPLICANT_COLUMNS)
+            .select_from(changed)
+            .join(
+                ApplicantOrm,
+                (ApplicantOrm.applicant_id == changed.c.applicant_id) & (ApplicantOrm.direction == direction)
+            )
+            .order_by(ApplicantOrm.rank.desc())
+        )
+        try:
+            results = await self.session.execute(stmt)
+            return [dict(row) for row in results.mappings()]
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ApplicantsReadingError(f"Error while reading changes: {e}") from e
+
+    async def prune_changes(self, older_than: timedelta) -> int:
+        try:
+            # Журнал очищается с начала и без последней записи, поэтому min(id) - 1 — граница очистки
+            pruned_version = (
+                select(func.max(ApplicantChangeOrm.id))
+                .where(ApplicantChangeOrm.created_at < func.now() - older_than)
+                .scalar_subquery()
+            )
+            last_version = select(func.max(ApplicantChangeOrm.id)).scalar_subquery()
+            stmt = delete(ApplicantChangeOrm).where(
+                ApplicantChangeOrm.id <= pruned_version,
+                ApplicantChangeOrm.id < last_version
+            )
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ApplicantsCreationError(f"Error while pruning changes: {e}") from e
+
     async def paginate(self, page: int, limit: int) -> list[CreatedApplicant]:
         try:
             offset = (page - 1) * limit
             stmt = (
                 select(ApplicantOrm)
+                .order_by(ApplicantOrm.id)
                 .offset(offset)
                 .limit(limit)
             )
-            results = await self.session.execute(stmt)
+            results = await self.read_session.execute(stmt)
             applicants = results.scalars().all()
             return [CreatedApplicant.model_validate(applicant) for applicant in applicants]
         except SQLAlchemyError as e:
-            await self.session.rollback()
+            await self.read_session.rollback()
             raise ApplicantsReadingError(f"Error while paginating applicants: {e}") from e
 
     async def paginate_by_direction(
@@ -122,16 +424,77 @@ class SQLApplicantRepository(ApplicantRepository):
             stmt = (
                 select(ApplicantOrm)
                 .where(ApplicantOrm.direction == direction)
+                .order_by(ApplicantOrm.rank, ApplicantOrm.id)
                 .offset(offset)
                 .limit(limit)
             )
-            results = await self.session.execute(stmt)
+            results = await self.read_session.execute(stmt)
             applicants = results.scalars().all()
             return [CreatedApplicant.model_validate(applicant) for applicant in applicants]
         except SQLAlchemyError as e:
-            await self.session.rollback()
+            await self.read_session.rollback()
             raise ApplicantsReadingError(f"Error while paginate by direction: {e}") from e
 
+    async def paginate_by_cursor(self, cursor: Optional[str], limit: int) -> ApplicantsPage:
+        stmt = select(ApplicantOrm).order_by(ApplicantOrm.id).limit(limit + 1)
+        if cursor is not None:
+            try:
+                stmt = stmt.where(ApplicantOrm.id > int(decode_cursor(cursor)["id"]))
+            except (ValueError, KeyError, TypeError) as e:
+                raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+        try:
+            results = await self.read_session.execute(stmt)
+            applicants = results.scalars().all()
+        except SQLAlchemyError as e:
+            await self.read_session.rollback()
+            raise ApplicantsReadingError(f"Error while paginating applicants: {e}") from e
+        next_cursor = encode_cursor({"id": applicants[limit - 1].id}) if len(applicants) > limit else None
+        return ApplicantsPage(
+            applicants=[CreatedApplicant.model_validate(applicant) for applicant in applicants[:limit]],
+            next_cursor=next_cursor
+        )
+
+    async def paginate_by_direction_cursor(
+            self,
+            direction: str,
+            cursor: Optional[str],
+            limit: int
+    ) -> ApplicantsPage:
+        stmt = (
+            select(ApplicantOrm)
+            .where(ApplicantOrm.direction == direction)
+            .order_by(ApplicantOrm.rank, ApplicantOrm.id)
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            try:
+                values = decode_cursor(cursor)
+                if values["direction"] != direction:
+                    raise ValueError("Cursor belongs to another direction")
+                stmt = stmt.where(
+                    tuple_(ApplicantOrm.rank, ApplicantOrm.id) > tuple_(int(values["rank"]), int(values["id"]))
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+        try:
+            results = await self.read_session.execute(stmt)
+            applicants = results.scalars().all()
+        except SQLAlchemyError as e:
+            await self.read_session.rollback()
+            raise ApplicantsReadingError(f"Error while paginate by direction: {e}") from e
+        next_cursor = None
+        if len(applicants) > limit:
+            last_applicant = applicants[limit - 1]
+            next_cursor = encode_cursor({
+                "direction": direction,
+                "rank": last_applicant.rank,
+                "id": last_applicant.id
+            })
+        return ApplicantsPage(
+            applicants=[CreatedApplicant.model_validate(applicant) for applicant in applicants[:limit]],
+            next_cursor=next_cursor
+        )
+
     async def sort_by_probability(self, applicant_id: int) -> list[CreatedApplicant]:
         try:
             stmt = (
@@ -139,11 +502,11 @@ class SQLApplicantRepository(ApplicantRepository):
                 .where(ApplicantOrm.applicant_id == applicant_id)
                 .order_by(ApplicantOrm.probability.desc())
             )
-            results = await self.session.execute(stmt)
+            results = await self.read_session.execute(stmt)
             applicants = results.scalars().all()
             return [CreatedApplicant.model_validate(applicant) for applicant in applicants]
         except SQLAlchemyError as e:
-            await self.session.rollback()
+            await self.read_session.rollback()
             raise ApplicantsReadingError(f"Error while sorting by probability: {e}") from e
 
     async def count(self) -> int:
@@ -152,8 +515,82 @@ class SQLApplicantRepository(ApplicantRepository):
                 select(func.count)
                 .select_from(ApplicantOrm)
             )
-            count = await self.session.execute(stmt)
+            count = await self.read_session.execute(stmt)
             return count.scalar()
         except SQLAlchemyError as e:
-            await self.session.rollback()
+            await self.read_session.rollback()
             raise ApplicantsReadingError(f"Error while reading count: {e}") from e
+
+
+class SQLSnapshotRepository(SnapshotRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def mark_processed(
+            self,
+            snapshot_id: str,
+            chunk_number: int,
+            is_last: bool,
+            directions: set[str]
+    ) -> Optional[set[str]]:
+        processed_chunks = (
+            select(func.count())
+            .where(SnapshotChunkOrm.snapshot_id == snapshot_id)
+            .scalar_subquery()
+        )
+        try:
+            await self.session.execute(
+                insert(SnapshotOrm)
+                .values(snapshot_id=snapshot_id)
+                .on_conflict_do_nothing(index_elements=[SnapshotOrm.snapshot_id])
+            )
+            # Строка снапшота заблокирована до коммита: чанки одного снапшота отмечаются по очереди,
+            # поэтому последний отмеченный видит все остальные, на каком бы консьюмере их ни обработали
+            await self.session.execute(
+                select(SnapshotOrm.id).where(SnapshotOrm.snapshot_id == snapshot_id).with_for_update()
+            )
+            if is_last:
+                await self.session.execute(
+                    update(SnapshotOrm)
+                    .where(SnapshotOrm.snapshot_id == snapshot_id)
+                    .values(total_chunks=chunk_number)
+                )
+            await self.session.execute(
+                insert(SnapshotChunkOrm)
+                .values(snapshot_id=snapshot_id, chunk_number=chunk_number, directions=sorted(directions))
+                .on_conflict_do_nothing(constraint="unique_snapshot_chunk")
+            )
+            # Снапшот завершается ровно один раз, повторно доставленные чанки его не завершают
+            completed = await self.session.scalar(
+                update(SnapshotOrm)
+                .where(
+                    SnapshotOrm.snapshot_id == snapshot_id,
+                    SnapshotOrm.completed_at.is_(None),
+                    SnapshotOrm.total_chunks == processed_chunks
+                )
+                .values(completed_at=func.now())
+                .returning(SnapshotOrm.id)
+            )
+            changed_directions = None
+            if completed is not None:
+                results = await self.session.execute(
+                    select(func.unnest(SnapshotChunkOrm.directions))
+                    .where(SnapshotChunkOrm.snapshot_id == snapshot_id)
+                    .distinct()
+                )
+                changed_directions = set(results.scalars())
+            await self.session.commit()
+            return changed_directions
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise SnapshotTrackingError(f"Error while marking snapshot chunk: {e}") from e
+
+    async def prune(self, older_than: timedelta) -> int:
+        try:
+            stmt = delete(SnapshotOrm).where(SnapshotOrm.created_at < func.now() - older_than)
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise SnapshotTrackingError(f"Error while pruning snapshots: {e}") from e
@@ -1,28 +1,31 @@
+import asyncio
 import logging
 
 import aiohttp
 
 from .base import ClassifierService, RecommendationService
 from .dto import ApplicantPredict, ApplicantRecommend, Prediction, Recommendation
-from .exceptions import PredictionError, RecommendationError
+from .exceptions import PredictionError, ClassifierUnavailableError, RecommendationError
+
+from ..http_client import HTTPClient
 
 
 class ClassifierAPI(ClassifierService):
-    def __init__(self, base_url: str) -> None:
+    def __init__(self, base_url: str, http_client: HTTPClient) -> None:
         self.logger = logging.getLogger(self.__class__.__name__)
         self.base_url = base_url
+        self._http_client = http_client
 
     async def predict(self, applicant: ApplicantPredict) -> Prediction:
         url = f"{self.base_url}/api/v1/classifier/predict"
         headers = {"Content-Type": "application/json; charset=UTF-8"}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url=url,
-                    headers=headers,
-                    json=applicant.model_dump()
-                ) as response:
-                    prediction = await response.json()
+            async with self._http_client.post(
+                url=url,
+                headers=headers,
+                json=applicant.model_dump()
+            ) as response:
+                prediction = await response.json()
             return Prediction.model_validate(prediction)
         except aiohttp.ClientError as e:
             self.logger.error(f"Error while predict: {e}")
@@ -33,35 +36,40 @@ class ClassifierAPI(ClassifierService):
         headers = {"Content-Type": "application/json; charset=UTF-8"}
         applicants = {"applicants": [applicant.model_dump() for applicant in applicants]}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url=url,
-                    headers=headers,
-                    json=applicants
-                ) as response:
-                    predictions = await response.json()
+            async with self._http_client.post(
+                url=url,
+                headers=headers,
+                json=applicants
+            ) as response:
+                if response.status >= 500:
+                    raise ClassifierUnavailableError(f"Classifier responded with {response.status}")
+                response.raise_for_status()
+                predictions = await response.json()
             return [Prediction.model_validate(prediction) for prediction in predictions]
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Classifier unavailable while predict batch: {e}")
+            raise ClassifierUnavailableError(f"Error while predict batch: {e}") from e
         except aiohttp.ClientError as e:
             self.logger.error(f"Error while predict batch: {e}")
             raise PredictionError(f"Error while predict batch: {e}") from e
 
 
 class RecommendationAPI(RecommendationService):
-    def __init__(self, base_url: str) -> None:
+    def __init__(self, base_url: str, http_client: HTTPClient) -> None:
         self.logger = logging.getLogger(self.__class__.__name__)
         self.base_url = base_url
+        self._http_client = http_client
 
     async def recommend(self, applicant: ApplicantRecommend, top_n: int) -> list[Recommendation]:
         url = f"{self.base_url}/api/v1/recommendations/?top_n={top_n}"
         headers = {"Content-Type": "application/json; charset=UTF-8"}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url=url,
-                    headers=headers,
-                    json=applicant.model_dump()
-                ) as response:
-                    data = await response.json()
+            async with self._http_client.post(
+                url=url,
+                headers=headers,
+                json=applicant.model_dump()
+            ) as response:
+                data = await response.json()
             return [
                 Recommendation(
                     direction_id=recommendation["direction_id"],
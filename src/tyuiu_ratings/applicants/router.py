@@ -1,15 +1,44 @@
-from typing import Annotated
+from typing import Annotated, Optional, Union
+from collections.abc import AsyncIterator
 
-from fastapi import APIRouter, status, HTTPException, Query
+import asyncio
+
+from fastapi import APIRouter, status, HTTPException, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka as Depends
 
 from .base import ApplicantRepository
+from .cache import CompetitionListCache, CachedCompetitionList, ChangeLogVersions
+from .deltas import DeltaHub, DeltaSubscription
 from .use_cases import RecommendDirectionsUseCase
-from .dto import RerankedPriority, CreatedApplicant, PredictedRecommendation, CompetitionList
-from .exceptions import ApplicantsReadingError, DirectionsRecommendationError
+from .dto import (
+    RerankedPriority,
+    CreatedApplicant,
+    PredictedRecommendation,
+    CompetitionList,
+    CompetitionListDelta,
+    CompetitionWindow,
+    ApplicantsPage,
+    ApplicantsBatch,
+    ApplicantsBatchRequest
+)
+from .exceptions import ApplicantsReadingError, InvalidCursorError, DirectionsRecommendationError
 
-from ..constants import MIN_TOP_N, MAX_TOP_N
+from ..responses import ORJSONBytesResponse, dump_json, make_etag, cache_headers, not_modified
+from ..constants import (
+    MIN_TOP_N,
+    MAX_TOP_N,
+    MIN_LIMIT,
+    MAX_LIMIT,
+    DEFAULT_LIMIT,
+    MIN_WINDOW_SIZE,
+    MAX_WINDOW_SIZE,
+    DEFAULT_WINDOW_SIZE,
+    BUDGET_PLACES_FOR_DIRECTIONS,
+    SSE_HEARTBEAT_INTERVAL,
+    MAX_STREAM_SUBSCRIPTION_KEYS
+)
 
 
 applicants_router = APIRouter(
@@ -19,6 +48,173 @@ applicants_router = APIRouter(
 )
 
 
+async def _get_direction_version(
+        direction: str,
+        applicant_repository: ApplicantRepository,
+        change_log_versions: ChangeLogVersions
+) -> int:
+    """Версия направления из кеша процесса, при промахе — из журнала изменений в БД"""
+    return await change_log_versions.get_direction_version(
+        direction, lambda: applicant_repository.get_direction_version(direction)
+    )
+
+
+async def _get_competition_list(
+        direction: str,
+        version: int,
+        applicant_repository: ApplicantRepository,
+        competition_list_cache: CompetitionListCache
+) -> Optional[CachedCompetitionList]:
+    """Берёт конкурсный список версии version из кеша, при промахе читает его из БД и кладёт в кеш"""
+    cached = competition_list_cache.get(direction, version)
+    if cached is not None:
+        return cached
+    # Список и версия читаются с primary, версия — до строк: строки могут оказаться новее версии, но не старее
+    applicants = await applicant_repository.get_rows_by_direction(direction)
+    return competition_list_cache.set(direction, version, applicants)
+
+
+async def _get_competition_list_delta(
+        applicant_id: int,
+        direction: str,
+        since: int,
+        version: int,
+        applicant_repository: ApplicantRepository
+) -> dict:
+    """Изменения списка с версии since до версии направления version, весь список если журнал её не покрывает"""
+    # Версии направлений коммитятся независимо, поэтому клиенту отдаётся версия направления, а не максимум журнала
+    min_version, _ = await applicant_repository.get_change_log_bounds()
+    full = since < min_version - 1 or since > version
+    if full:
+        applicants = await applicant_repository.get_rows_by_direction(direction)
+    else:
+        applicants = await applicant_repository.get_changes_since(direction, since)
+    return {
+        "applicant_id": applicant_id,
+        "direction": direction,
+        "version": version,
+        "full": full,
+        "applicants": applicants
+    }
+
+
+async def _stream_deltas(
+        request: Request,
+        delta_hub: DeltaHub,
+        subscription: DeltaSubscription
+) -> AsyncIterator[bytes]:
+    """Отдаёт пакеты изменений как server-sent events, пока клиент не отключится"""
+    try:
+        while not await request.is_disconnected():
+            try:
+                deltas = await asyncio.wait_for(subscription.get(), timeout=SSE_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            data = dump_json([delta.model_dump() for delta in deltas])
+            yield b"event: deltas\ndata: " + data + b"\n\n"
+    finally:
+        delta_hub.unsubscribe(subscription)
+
+
+@applicants_router.get(
+    path="",
+    status_code=status.HTTP_200_OK,
+    response_model=ApplicantsPage,
+    summary="Возвращает страницу абитуриентов по курсору"
+)
+async def get_applicants_page(
+        applicant_repository: Depends[ApplicantRepository],
+        cursor: Annotated[Optional[str], Query(description="Токен следующей страницы")] = None,
+        limit: Annotated[
+            int,
+            Query(ge=MIN_LIMIT, le=MAX_LIMIT, description="Размер страницы")
+        ] = DEFAULT_LIMIT,
+        direction: Annotated[Optional[str], Query(description="Направление подготовки")] = None
+) -> ApplicantsPage:
+    try:
+        if direction is None:
+            return await applicant_repository.paginate_by_cursor(cursor, limit)
+        return await applicant_repository.paginate_by_direction_cursor(direction, cursor, limit)
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    except ApplicantsReadingError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error while receiving applicants"
+        )
+
+
+@applicants_router.get(
+    path="/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Стримит изменения конкурсных списков (rank, probability, original) после каждой загрузки"
+)
+async def stream_deltas(
+        request: Request,
+        delta_hub: Depends[DeltaHub],
+        directions: Annotated[list[str], Query(description="Направления подготовки")] = [],  # noqa: B006
+        applicant_ids: Annotated[list[int], Query(description="ID абитуриентов")] = []  # noqa: B006
+) -> StreamingResponse:
+    if not directions and not applicant_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Specify directions or applicant_ids"
+        )
+    if len(directions) + len(applicant_ids) > MAX_STREAM_SUBSCRIPTION_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many subscription keys, max {MAX_STREAM_SUBSCRIPTION_KEYS}"
+        )
+    subscription = delta_hub.subscribe(directions, applicant_ids)
+    return StreamingResponse(
+        _stream_deltas(request, delta_hub, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@applicants_router.post(
+    path="/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=ApplicantsBatch,
+    summary="Возвращает абитуриентов по списку ID и пар (ID, направление) одним запросом"
+)
+async def get_applicants_batch(
+        batch_request: ApplicantsBatchRequest,
+        applicant_repository: Depends[ApplicantRepository]
+) -> ORJSONBytesResponse:
+    keys = [(key.applicant_id, key.direction) for key in batch_request.keys]
+    try:
+        rows = await applicant_repository.lookup_rows(batch_request.applicant_ids, keys)
+    except ApplicantsReadingError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error while receiving applicants"
+        )
+    requested_ids = set(batch_request.applicant_ids)
+    applicants: dict[str, list] = {str(applicant_id): [] for applicant_id in requested_ids}
+    rows_by_key = {}
+    for row in rows:
+        if row["applicant_id"] in requested_ids:
+            applicants[str(row["applicant_id"])].append(row)
+        rows_by_key[(row["applicant_id"], row["direction"])] = row
+    return ORJSONBytesResponse({
+        "applicants": applicants,
+        "keys": [
+            {
+                "applicant_id": applicant_id,
+                "direction": direction,
+                "applicant": rows_by_key.get((applicant_id, direction))
+            }
+            for applicant_id, direction in keys
+        ]
+    })
+
+
 @applicants_router.get(
     path="/{applicant_id}",
     status_code=status.HTTP_200_OK,
@@ -27,16 +223,25 @@ applicants_router = APIRouter(
 )
 async def get_applicants(
         applicant_id: int,
-        applicant_repository: Depends[ApplicantRepository]
-) -> list[CreatedApplicant]:
+        applicant_repository: Depends[ApplicantRepository],
+        change_log_versions: Depends[ChangeLogVersions],
+        if_none_match: Annotated[Optional[str], Header()] = None
+) -> Response:
     try:
-        applicants = await applicant_repository.read(applicant_id)
+        # Версия берётся из кеша, который загрузки освобождают; в БД запрос идёт только при промахе
+        version = await change_log_versions.get_applicant_version(
+            applicant_id, lambda: applicant_repository.get_applicant_version(applicant_id)
+        )
+        etag = make_etag(version)
+        if (response := not_modified(if_none_match, etag)) is not None:
+            return response
+        applicants = await applicant_repository.read_rows(applicant_id)
         if not applicants:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Applicants not found"
             )
-        return applicants
+        return ORJSONBytesResponse(applicants, headers=cache_headers(etag))
     except ApplicantsReadingError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -73,32 +278,94 @@ async def get_applicant(
 @applicants_router.get(
     path="/{applicant_id}/competition-list",
     status_code=status.HTTP_200_OK,
-    response_model=CompetitionList,
-    summary="Возвращает интерактивный конкурсный список на направление подготовки"
+    response_model=Union[CompetitionList, CompetitionListDelta],
+    summary="Возвращает интерактивный конкурсный список на направление подготовки",
+    description="С параметром since возвращает только изменения после этой версии журнала"
 )
 async def get_competition_list(
         applicant_id: int,
         direction: Annotated[str, Query(..., description="Направление подготовки")],
-        applicant_repository: Depends[ApplicantRepository]
-) -> CompetitionList:
+        applicant_repository: Depends[ApplicantRepository],
+        competition_list_cache: Depends[CompetitionListCache],
+        change_log_versions: Depends[ChangeLogVersions],
+        since: Annotated[Optional[int], Query(ge=0, description="Версия из прошлого ответа")] = None,
+        if_none_match: Annotated[Optional[str], Header()] = None
+) -> Response:
     try:
-        applicants = await applicant_repository.get_applicants_by_direction(direction)
-        if not applicants:
+        version = await _get_direction_version(direction, applicant_repository, change_log_versions)
+        etag = make_etag(version, since)
+        if (response := not_modified(if_none_match, etag)) is not None:
+            return response
+        if since is not None:
+            delta = await _get_competition_list_delta(
+                applicant_id, direction, since, version, applicant_repository
+            )
+            return ORJSONBytesResponse(delta, headers=cache_headers(etag))
+        cached = await _get_competition_list(direction, version, applicant_repository, competition_list_cache)
+        if cached is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No applicants yet"
             )
-        return CompetitionList(
-            applicant_id=applicant_id,
-            institute=applicants[0].institute,
-            direction=direction,
-            applicants=applicants
+        return ORJSONBytesResponse(cached.render(applicant_id, direction), headers=cache_headers(etag))
+    except ApplicantsReadingError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error while receiving competition list"
         )
+
+
+@applicants_router.get(
+    path="/{applicant_id}/competition-window",
+    status_code=status.HTTP_200_OK,
+    response_model=CompetitionWindow,
+    summary="Возвращает ±k позиций конкурсного списка вокруг абитуриента"
+)
+async def get_competition_window(
+        applicant_id: int,
+        direction: Annotated[str, Query(..., description="Направление подготовки")],
+        applicant_repository: Depends[ApplicantRepository],
+        competition_list_cache: Depends[CompetitionListCache],
+        change_log_versions: Depends[ChangeLogVersions],
+        k: Annotated[
+            int,
+            Query(ge=MIN_WINDOW_SIZE, le=MAX_WINDOW_SIZE, description="Количество позиций выше и ниже")
+        ] = DEFAULT_WINDOW_SIZE,
+        if_none_match: Annotated[Optional[str], Header()] = None
+) -> Response:
+    try:
+        version = await _get_direction_version(direction, applicant_repository, change_log_versions)
+        etag = make_etag(version)
+        if (response := not_modified(if_none_match, etag)) is not None:
+            return response
+        cached = await _get_competition_list(direction, version, applicant_repository, competition_list_cache)
     except ApplicantsReadingError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error while receiving competition list"
         )
+    window = cached.window(applicant_id, k) if cached is not None else None
+    if window is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Applicant not found"
+        )
+    position, applicants = window
+    rank = cached.ranked[position]["rank"]
+    budget_places = BUDGET_PLACES_FOR_DIRECTIONS.get(direction)
+    if not isinstance(budget_places, int):
+        budget_places = None
+    return ORJSONBytesResponse({
+        "applicant_id": applicant_id,
+        "institute": cached.institute,
+        "direction": direction,
+        "rank": rank,
+        "total": len(cached.ranked),
+        "originals_above": cached.originals_above[position],
+        "budget_places": budget_places,
+        "budget_gap": rank - budget_places if budget_places is not None else None,
+        "applicants": applicants
+    }, headers=cache_headers(etag))
 
 
 @applicants_router.get(
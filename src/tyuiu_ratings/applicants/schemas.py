@@ -28,6 +28,18 @@ class Applicant(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+    def fingerprint(self) -> tuple:
+        """Поля, изменение которых требует нового предсказания и перезаписи абитуриента"""
+        return (
+            self.rank,
+            self.points,
+            self.bonus_points,
+            self.priority,
+            self.original,
+            self.institute,
+            self.direction
+        )
+
     def to_create(self, probability: float) -> "ApplicantCreate":
         from .dto import ApplicantCreate
         return ApplicantCreate(
@@ -0,0 +1,34 @@
+import logging
+from datetime import timedelta
+
+from dishka import Scope
+
+from .base import ApplicantRepository, SnapshotRepository
+from .exceptions import ApplicantsCreationError, SnapshotTrackingError
+
+from ..ioc import container
+from ..constants import CHANGE_LOG_RETENTION_DAYS, SNAPSHOT_RETENTION_HOURS
+
+logger = logging.getLogger(__name__)
+
+
+async def prune_applicant_changes_task() -> None:
+    """Задача для очистки устаревших записей журнала изменений конкурсных списков"""
+    async with container(scope=Scope.REQUEST) as request_container:
+        applicant_repository = await request_container.get(ApplicantRepository)
+        try:
+            pruned = await applicant_repository.prune_changes(timedelta(days=CHANGE_LOG_RETENTION_DAYS))
+            logger.info(f"Pruned {pruned} applicant changes")
+        except ApplicantsCreationError as e:
+            logger.error(f"Error while pruning applicant changes: {e}")
+
+
+async def prune_snapshots_task() -> None:
+    """Задача для удаления прогресса старых снапшотов конкурсного списка"""
+    async with container(scope=Scope.REQUEST) as request_container:
+        snapshot_repository = await request_container.get(SnapshotRepository)
+        try:
+            pruned = await snapshot_repository.prune(timedelta(hours=SNAPSHOT_RETENTION_HOURS))
+            logger.info(f"Pruned {pruned} snapshots")
+        except SnapshotTrackingError as e:
+            logger.error(f"Error while pruning snapshots: {e}")
@@ -1,13 +1,19 @@
-from typing import TYPE_CHECKING
+from typing import NamedTuple, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..ratings.base import RatingRepository
     from ..profiles.schemas import Profile
 
+import asyncio
+import logging
+
 from .schemas import Applicant
+from .cache import CompetitionListCache, ChangeLogVersions
+from .deltas import DeltaHub
 from .base import ClassifierService, RecommendationService, ApplicantRepository
 from .dto import (
     ApplicantUpdateEvent,
+    ApplicantDelta,
     ApplicantPredict,
     ApplicantRecommend,
     Prediction,
@@ -15,28 +21,136 @@ from .dto import (
     PredictedRecommendation
 )
 from .exceptions import (
-    ApplicantsCreationError,
+    ApplicantsReadingError,
     RecommendationError,
     PredictionError,
     DirectionsRecommendationError
 )
 
+from ..base import TransactionManager
+from ..ratings.dto import RatingCreation
+from ..constants import INGEST_CHUNK_SIZE, INGEST_PIPELINE_DEPTH
+
+
+class PredictedChunk(NamedTuple):
+    """Чанк конкурсного списка с предсказаниями для изменившихся абитуриентов"""
+    changed_applicants: list[Applicant]
+    predictions: list[Prediction]
+
 
 class UpdateApplicantsUseCase:
+    """Загрузка конкурсного списка конвейером: пока чанк N записывается в БД,
+    для чанка N+1 уже запрашиваются предсказания.
+    """
     def __init__(
             self,
             applicant_repository: ApplicantRepository,
             rating_repository: "RatingRepository",
-            classifier_service: ClassifierService
+            classifier_service: ClassifierService,
+            transaction_manager: TransactionManager,
+            competition_list_cache: CompetitionListCache,
+            change_log_versions: ChangeLogVersions,
+            delta_hub: DeltaHub,
+            chunk_size: int = INGEST_CHUNK_SIZE,
+            pipeline_depth: int = INGEST_PIPELINE_DEPTH
     ) -> None:
         self._applicant_repository = applicant_repository
         self._rating_repository = rating_repository
         self._classifier_service = classifier_service
+        self._transaction_manager = transaction_manager
+        self._competition_list_cache = competition_list_cache
+        self._change_log_versions = change_log_versions
+        self._delta_hub = delta_hub
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._chunk_size = chunk_size
+        self._pipeline_depth = pipeline_depth
 
-    async def __call__(self, applicants: list[ApplicantUpdateEvent]) -> None:
-        predictions = await self._get_predictions(applicants)
-        await self._update_applicants(applicants, predictions)
-        await self._save_ratings(applicants)
+    async def __call__(self, applicants: list[ApplicantUpdateEvent]) -> set[str]:
+        """Загружает абитуриентов, возвращает направления, чьи списки изменились"""
+        changed_applicants = await self._filter_changed(applicants)
+        changed_keys = {(applicant.applicant_id, applicant.direction) for applicant in changed_applicants}
+        queue: asyncio.Queue[Optional[PredictedChunk | Exception]] = asyncio.Queue(maxsize=self._pipeline_depth)
+        predict_task = asyncio.create_task(self._predict_stage(applicants, changed_keys, queue))
+        try:
+            await self._write_stage(queue)
+        except BaseException:
+            predict_task.cancel()
+            raise
+        await predict_task
+        return {applicant.direction for applicant in changed_applicants}
+
+    async def _filter_changed(self, applicants: list[Applicant]) -> list[Applicant]:
+        """Оставляет новых абитуриентов и тех, чьи данные изменились с прошлой загрузки"""
+        try:
+            stored_applicants = await self._applicant_repository.get_applicants_by_keys([
+                (applicant.applicant_id, applicant.direction) for applicant in applicants
+            ])
+        except ApplicantsReadingError:
+            return applicants
+        fingerprints = {
+            (applicant.applicant_id, applicant.direction): applicant.fingerprint()
+            for applicant in stored_applicants
+        }
+        return [
+            applicant for applicant in applicants
+            if fingerprints.get((applicant.applicant_id, applicant.direction)) != applicant.fingerprint()
+        ]
+
+    async def _predict_stage(
+            self,
+            applicants: list[Applicant],
+            changed_keys: set[tuple[int, str]],
+            queue: asyncio.Queue[Optional[PredictedChunk | Exception]]
+    ) -> None:
+        """Получает предсказания по чанкам и передаёт их на запись через ограниченную очередь"""
+        try:
+            for start in range(0, len(applicants), self._chunk_size):
+                chunk = applicants[start:start + self._chunk_size]
+                changed_applicants = [
+                    applicant for applicant in chunk
+                    if (applicant.applicant_id, applicant.direction) in changed_keys
+                ]
+                predictions = await self._get_predictions(changed_applicants) if changed_applicants else []
+                await queue.put(PredictedChunk(changed_applicants, predictions))
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(None)
+
+    async def _write_stage(self, queue: asyncio.Queue[Optional[PredictedChunk | Exception]]) -> None:
+        """Записывает абитуриентов и рейтинги каждого чанка в одной транзакции"""
+        while (item := await queue.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            try:
+                if item.changed_applicants:
+                    await self._update_applicants(item.changed_applicants, item.predictions)
+                    # Срез рейтинга пишется только для изменившихся абитуриентов, неизменные не переписываются
+                    await self._save_ratings(item.changed_applicants)
+                # Журнал пишется последним: его блокировка держится только до коммита
+                await self._applicant_repository.record_changes([
+                    (applicant.applicant_id, applicant.direction) for applicant in item.changed_applicants
+                ])
+                await self._transaction_manager.commit()
+            except BaseException:
+                await self._transaction_manager.rollback()
+                raise
+            changed_directions = {applicant.direction for applicant in item.changed_applicants}
+            self._competition_list_cache.invalidate(changed_directions)
+            self._change_log_versions.invalidate(
+                (applicant.applicant_id, applicant.direction) for applicant in item.changed_applicants
+            )
+            # Событие рассылается для каждого записанного чанка, даже без изменившихся абитуриентов
+            await self._delta_hub.publish([
+                ApplicantDelta(
+                    applicant_id=applicant.applicant_id,
+                    direction=applicant.direction,
+                    rank=applicant.rank,
+                    probability=prediction.probability,
+                    original=applicant.original
+                )
+                for applicant, prediction in zip(item.changed_applicants, item.predictions)
+            ], changed_directions)
 
     async def _get_predictions(self, applicants: list[Applicant]) -> list[Prediction]:
         applicant_predicts = [
@@ -58,21 +172,17 @@ class UpdateApplicantsUseCase:
             applicant.to_create(prediction.probability)
             for applicant, prediction in zip(applicants, predictions)
         ]
-        try:
-            await self._applicant_repository.bulk_upsert(applicants_create)
-        except ApplicantsCreationError:
-            return
+        await self._applicant_repository.bulk_upsert(applicants_create, commit=False)
 
     async def _save_ratings(self, applicants: list[Applicant]) -> None:
-        from ..ratings.dto import RatingCreation
-        await self._rating_repository.bulk_upsert([
+        await self._rating_repository.load_snapshot([
             RatingCreation(
                 applicant_id=applicant.applicant_id,
                 direction=applicant.direction,
                 rank=applicant.rank
             )
             for applicant in applicants
-        ])
+        ], commit=False)
 
 
 class RecommendDirectionsUseCase:
@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+
+
+class TransactionManager(ABC):
+    """Управление транзакцией для сценариев, объединяющих записи нескольких репозиториев"""
+    @abstractmethod
+    async def commit(self) -> None: pass
+
+    @abstractmethod
+    async def rollback(self) -> None: pass
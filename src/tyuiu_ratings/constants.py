@@ -56,6 +56,7 @@ DIRECTION = Literal[""]
 
 # Маппинг направлений подготовки:
 DIRECTIONS_MAPPING_CSV = BASE_DIR / "file_store" / "directions_mapping_2025.csv"
+DIRECTIONS_MAPPING_RELOAD_INTERVAL = 60  # Как часто (в секундах) проверять изменение файла маппинга
 
 # Уровни уведомлений абитуриентам:
 NOTIFICATION_LEVEL = Literal[
@@ -75,6 +76,9 @@ RATING_STATUS = Literal[
 # Пагинация:
 MIN_PAGE = 1
 DEFAULT_LIMIT = 100
+MIN_LIMIT = 1
+MAX_LIMIT = 1000
+MAX_BATCH_LOOKUP_SIZE = 500  # Максимальное количество ключей в пакетном запросе абитуриентов
 
 # Пороговые значения:
 POSITIVE_THRESHOLD_PROBABILITY = 0.75
@@ -84,27 +88,110 @@ WARNING_BUDGET_ZONE_THRESHOLD = 5
 
 # Rabbit-MQ очереди:
 NOTIFICATIONS_QUEUE = "telegram.notifications"
+APPLICANTS_QUEUE = "applicants"
+APPLICANT_DELTAS_EXCHANGE = "applicants.deltas"  # Fanout обмен изменений конкурсных списков между репликами API
+
+# Через сколько часов снапшот конкурсного списка удаляется из БД, завершённым или нет:
+SNAPSHOT_RETENTION_HOURS = 6
+
+# Объединение небольших сообщений очереди абитуриентов в батчи:
+COALESCE_MAX_BATCH_SIZE = 2000  # Батч обрабатывается, как только в нём набирается столько абитуриентов
+COALESCE_MAX_DELAY = 0.5  # Или через столько секунд после первого сообщения в батче
+DEFAULT_RABBIT_PREFETCH_COUNT = 50  # Количество неподтверждённых сообщений на канал
+DEFAULT_RABBIT_CONSUMER_CONCURRENCY = 2  # Количество батчей, обрабатываемых одновременно
 
 # Значения для отправки уведомлений абитуриентам:
 DAYS_COUNT = 10  # Количество дней для проверки стабильности рейтинга
 MAX_CHANGE = 5  # Максимальное изменение в рейтинге за определённое количество дней
 TOP_RATING = 10
+RATING_FEATURES_BATCH_SIZE = 1000  # Количество признаков рейтинга, читаемых из курсора за раз
+
+# Сводка истории рейтинга, обновляемая при загрузке среза:
+RATING_SUMMARY_EWMA_ALPHA = 0.3  # Вес последнего изменения позиции в EWMA
+RATING_SUMMARY_LOCK_ID = 20_261_017  # Ключ advisory lock: пересборка сводки берёт его эксклюзивно, загрузки срезов — разделяемо
 
 # Количество получаемых рекомендаций:
 MIN_TOP_N = 1
 MAX_TOP_N = 52
 DEFAULT_TOP_N = 15
 
+# Окно конкурсного списка вокруг абитуриента (±k позиций):
+MIN_WINDOW_SIZE = 1
+MAX_WINDOW_SIZE = 100
+DEFAULT_WINDOW_SIZE = 10
+
+# Перцентили распределения баллов в статистике направлений:
+POINTS_PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
 # Драйвер для работы с Postgres:
 PG_DRIVER: Literal["asyncpg"] = "asyncpg"
 
+# Массовая запись в БД:
+BULK_UPSERT_CHUNK_SIZE = 1000  # Количество строк в одном INSERT ... ON CONFLICT
+COPY_THRESHOLD = 10_000  # Начиная с этого количества строк запись идёт через COPY во временную таблицу
+
+# Конвейер загрузки конкурсного списка:
+INGEST_CHUNK_SIZE = 2000  # Количество абитуриентов в одной транзакции
+INGEST_PIPELINE_DEPTH = 2  # Сколько чанков с предсказаниями может ждать записи
+
+# Пул HTTP-соединений к внешним сервисам (классификатор, рекомендательная система):
+DEFAULT_HTTP_POOL_LIMIT = 100  # Максимальное количество соединений в пуле
+DEFAULT_HTTP_POOL_LIMIT_PER_HOST = 20  # Максимальное количество соединений к одному хосту
+DEFAULT_HTTP_DNS_CACHE_TTL = 300  # Время жизни DNS-кеша в секундах
+DEFAULT_HTTP_CONNECT_TIMEOUT = 5  # Таймаут на установку соединения в секундах
+DEFAULT_HTTP_READ_TIMEOUT = 60  # Таймаут на чтение ответа в секундах
+DEFAULT_HTTP_KEEPALIVE_TIMEOUT = 60  # Время жизни неактивного keep-alive соединения в секундах
+
+# Разбиение запросов к классификатору на чанки:
+MIN_PREDICT_CHUNK_SIZE = 50
+MAX_PREDICT_CHUNK_SIZE = 5000
+DEFAULT_PREDICT_CHUNK_SIZE = 500
+PREDICT_MAX_CONCURRENCY = 4  # Количество чанков, отправляемых одновременно
+PREDICT_TARGET_LATENCY = 2.0  # Пока чанк обрабатывается быстрее (в секундах), его размер растёт
+PREDICT_MAX_RETRIES = 3  # Количество повторов упавшего чанка
+PREDICT_RETRY_BACKOFF = 0.5  # Базовая задержка между повторами в секундах
+
 # Время истечения кеша в секундах:
 DEFAULT_CACHE_EXPIRE = 3600  # 1 час
 RATING_HISTORY_CACHE_EXPIRE = 3600 * 24  # Сутки
 
+# Условные GET запросы:
+HTTP_CACHE_MAX_AGE = 5  # Сколько секунд прокси и клиент могут отдавать ответ без перепроверки
+
+# Кеш предсказаний классификатора:
+PREDICTIONS_CACHE_MAXSIZE = 100_000  # Максимальное количество записей в памяти процесса
+PREDICTIONS_CACHE_PREFIX = "predictions"  # Префикс ключей в Redis
+PREDICTIONS_CACHE_FLUSH_BATCH = 1000  # Количество ключей, удаляемых из Redis одной командой
+
+# Кеш конкурсных списков:
+COMPETITION_LIST_CACHE_MAXSIZE = 1000  # Максимальное количество направлений в памяти процесса
+COMPETITION_LIST_CACHE_TTL = 60  # Предельное устаревание списка на репликах без загрузки
+
+# Кеш версий журнала изменений для ETag:
+VERSION_CACHE_MAXSIZE = 100_000  # Максимальное количество направлений и абитуриентов в памяти процесса
+VERSION_CACHE_TTL = 60  # Предельное устаревание версии, если событие загрузки не дошло до реплики
+
 # Часовой пояс:
 CURRENT_TIMEZONE = "Asia/Yekaterinburg"
 
 # Время для запуска рассылки уведомлений:
 BROADCAST_HOURS = 9
 BROADCAST_MINUTES = 0
+
+# Журнал изменений конкурсных списков для дельта-синхронизации:
+CHANGE_LOG_RETENTION_DAYS = 3  # Сколько дней хранятся записи журнала
+CHANGE_LOG_LOCK_ID = 20_250_614  # Пространство advisory lock направлений, упорядочивающих версии журнала по коммитам
+CHANGE_LOG_PRUNE_HOURS = 4  # Время ежедневной очистки журнала
+CHANGE_LOG_PRUNE_MINUTES = 0
+
+# Стриминг изменений конкурсных списков (SSE):
+DELTA_SUBSCRIPTION_QUEUE_SIZE = 100  # Пакетов изменений в очереди подписчика, старые отбрасываются
+SSE_HEARTBEAT_INTERVAL = 15  # Секунд между keep-alive комментариями
+DELTA_PUBLISH_RETRIES = 5  # Повторов рассылки изменений между репликами, если брокер недоступен
+DELTA_PUBLISH_RETRY_DELAY = 1  # Секунд до первого повтора, каждый следующий вдвое дольше
+MAX_STREAM_SUBSCRIPTION_KEYS = 100  # Направлений и ID абитуриентов в одной подписке
+
+# Реплики Postgres для чтения:
+DEFAULT_MAX_REPLICA_LAG = 5.0  # Секунд отставания, после которых чтение уходит на primary
+REPLICA_LAG_CHECK_INTERVAL = 5.0  # Как часто перепроверяется отставание реплик
+REPLICA_LAG_CHECK_TIMEOUT = 1.0  # Реплика, не ответившая за это время, считается недоступной
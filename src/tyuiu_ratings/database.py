@@ -1,10 +1,33 @@
+from typing import NewType, Optional
+from collections.abc import Iterable, Sequence
+
+import time
+import asyncio
+import logging
 from datetime import datetime
+from uuid import uuid4
 
-from sqlalchemy import func
+from pydantic import BaseModel
+from sqlalchemy import func, text, make_url
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 
+from .base import TransactionManager
 from .settings import PostgresSettings
+from .constants import DEFAULT_MAX_REPLICA_LAG, REPLICA_LAG_CHECK_INTERVAL, REPLICA_LAG_CHECK_TIMEOUT
+
+# Сессия только для чтения: реплика, либо primary если здоровых реплик нет
+ReadSession = NewType("ReadSession", AsyncSession)
+
+# Отставание реплики в секундах, 0 для primary и для реплики без непроигранного WAL
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+logger = logging.getLogger(__name__)
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -21,6 +44,17 @@ class Base(AsyncAttrs, DeclarativeBase):
     )
 
 
+class SQLTransactionManager(TransactionManager):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+
 def create_session_factory(pg_settings: PostgresSettings) -> async_sessionmaker[AsyncSession]:
     engine = create_async_engine(url=pg_settings.sqlalchemy_url, echo=True)
     return async_sessionmaker(
@@ -29,3 +63,115 @@ def create_session_factory(pg_settings: PostgresSettings) -> async_sessionmaker[
         autoflush=False,
         expire_on_commit=False
     )
+
+
+class ReplicaStats(BaseModel):
+    """Состояние реплики для чтения"""
+    url: str  # DSN без пароля
+    lag: Optional[float] = None  # Отставание в секундах, None если реплика не ответила
+    healthy: bool = False
+
+
+class Replica:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.engine: AsyncEngine = create_async_engine(url=url, pool_pre_ping=True)
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+        self.lag: Optional[float] = None
+        self.healthy = False
+
+
+class ReplicaRouter:
+    """Распределяет чтение по репликам, отставание которых не превышает max_lag.
+    Отставание перепроверяется не чаще раза в check_interval секунд.
+    """
+    def __init__(
+            self,
+            replica_urls: list[str],
+            max_lag: float = DEFAULT_MAX_REPLICA_LAG,
+            check_interval: float = REPLICA_LAG_CHECK_INTERVAL,
+            check_timeout: float = REPLICA_LAG_CHECK_TIMEOUT
+    ) -> None:
+        self._replicas = [Replica(url) for url in replica_urls]
+        self._max_lag = max_lag
+        self._check_interval = check_interval
+        self._check_timeout = check_timeout
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+        self._counter = 0
+
+    async def get_session_factory(self) -> Optional[async_sessionmaker[AsyncSession]]:
+        """Фабрика сессий здоровой реплики по кругу, None если читать нужно с primary"""
+        if not self._replicas:
+            return None
+        if time.monotonic() - self._checked_at >= self._check_interval:
+            await self._check_lag()
+        healthy_replicas = [replica for replica in self._replicas if replica.healthy]
+        if not healthy_replicas:
+            return None
+        self._counter += 1
+        return healthy_replicas[self._counter % len(healthy_replicas)].session_factory
+
+    async def _check_lag(self) -> None:
+        async with self._lock:
+            if time.monotonic() - self._checked_at < self._check_interval:
+                return
+            await asyncio.gather(*(self._check_replica(replica) for replica in self._replicas))
+            self._checked_at = time.monotonic()
+
+    async def _check_replica(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(self._check_timeout):
+                async with replica.engine.connect() as connection:
+                    replica.lag = float(await connection.scalar(REPLICA_LAG_QUERY))
+        except Exception as e:
+            replica.lag = None
+            if replica.healthy:
+                logger.warning(f"Replica {self._mask(replica.url)} is unavailable: {e}")
+        was_healthy = replica.healthy
+        replica.healthy = replica.lag is not None and replica.lag <= self._max_lag
+        if was_healthy and not replica.healthy and replica.lag is not None:
+            logger.warning(f"Replica {self._mask(replica.url)} lags {replica.lag:.1f}s, reading from primary")
+
+    def stats(self) -> list[ReplicaStats]:
+        return [
+            ReplicaStats(url=self._mask(replica.url), lag=replica.lag, healthy=replica.healthy)
+            for replica in self._replicas
+        ]
+
+    async def close(self) -> None:
+        for replica in self._replicas:
+            await replica.engine.dispose()
+
+    @staticmethod
+    def _mask(url: str) -> str:
+        return make_url(url).render_as_string(hide_password=True)
+
+
+async def copy_to_staging_table(
+        session: AsyncSession,
+        table_name: str,
+        columns: Sequence[str],
+        records: Iterable[tuple]
+) -> str:
+    """Загружает записи через COPY во временную таблицу со структурой table_name.
+    Таблица живёт до конца текущей транзакции, возвращается её имя.
+    """
+    staging_table = f"{table_name}_staging_{uuid4().hex[:8]}"
+    await session.execute(text(
+        f"CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS "
+        f"SELECT {', '.join(columns)} FROM {table_name} WITH NO DATA"
+    ))
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        staging_table,
+        records=records,
+        columns=list(columns)
+    )
+    return staging_table
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from abc import ABC, abstractmethod
+
+from .schemas import DirectionStats
+
+
+class DirectionStatsRepository(ABC):
+    @abstractmethod
+    async def refresh(self, directions: list[str]) -> int:
+        """Пересчитывает статистику затронутых направлений, возвращает количество обновлённых строк"""
+        pass
+
+    @abstractmethod
+    async def read(self, direction: str) -> Optional[DirectionStats]: pass
+
+    @abstractmethod
+    async def read_all(self) -> list[DirectionStats]: pass
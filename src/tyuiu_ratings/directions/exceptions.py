@@ -0,0 +1,8 @@
+
+
+class DirectionStatsRefreshError(Exception):
+    pass
+
+
+class DirectionStatsReadingError(Exception):
+    pass
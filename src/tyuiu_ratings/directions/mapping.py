@@ -0,0 +1,63 @@
+from typing import Optional
+
+import csv
+import logging
+import os
+import re
+import time
+from pathlib import Path
+
+from ..constants import DIRECTIONS_MAPPING_CSV, DIRECTIONS_MAPPING_RELOAD_INTERVAL
+
+
+# Колонки файла маппинга:
+SOURCE_COLUMN = "Направление подготовки 2025"
+TARGET_COLUMN = "Направление подготовки"
+
+NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_direction(direction: str) -> str:
+    """Приводит название направления к ключу индекса (без регистра, пунктуации и лишних пробелов)"""
+    return NON_WORD_PATTERN.sub(" ", direction).strip().casefold()
+
+
+class DirectionsMapper:
+    """Маппинг направлений подготовки, загруженный из CSV в хеш-индекс.
+    Файл перечитывается, если он изменился (проверка не чаще reload_interval секунд).
+    """
+    def __init__(
+            self,
+            file_path: Path,
+            reload_interval: float = DIRECTIONS_MAPPING_RELOAD_INTERVAL
+    ) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._file_path = file_path
+        self._reload_interval = reload_interval
+        self._index: dict[str, str] = {}
+        self._mtime: Optional[int] = None
+        self._checked_at = 0.0
+
+    def map(self, direction: str) -> Optional[str]:
+        self._reload_if_changed()
+        return self._index.get(normalize_direction(direction))
+
+    def reload(self) -> None:
+        mtime = os.stat(self._file_path).st_mtime_ns
+        index: dict[str, str] = {}
+        with open(self._file_path, encoding="utf-8", newline="") as file:
+            for row in csv.DictReader(file):
+                index.setdefault(normalize_direction(row[SOURCE_COLUMN]), row[TARGET_COLUMN])
+        self._index, self._mtime = index, mtime
+        self.logger.info(f"Loaded {len(index)} directions from {self._file_path}")
+
+    def _reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if self._mtime is not None and now - self._checked_at < self._reload_interval:
+            return
+        self._checked_at = now
+        if os.stat(self._file_path).st_mtime_ns != self._mtime:
+            self.reload()
+
+
+directions_mapper = DirectionsMapper(DIRECTIONS_MAPPING_CSV)
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from sqlalchemy import Float, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database import Base
+
+
+class DirectionStatsOrm(Base):
+    """Агрегаты конкурсного списка направления, пересчитываются после каждой загрузки"""
+    __tablename__ = "direction_stats"
+
+    direction: Mapped[str] = mapped_column(nullable=False)
+    applicants_count: Mapped[int]
+    originals_count: Mapped[int]
+    min_points: Mapped[int]
+    max_points: Mapped[int]
+    avg_points: Mapped[float]
+    points_percentiles: Mapped[list[float]] = mapped_column(ARRAY(Float))
+    budget_places: Mapped[Optional[int]]
+    cutoff_rank: Mapped[Optional[int]]
+    cutoff_points: Mapped[Optional[int]]
+    cutoff_probability: Mapped[Optional[float]]
+
+    __table_args__ = (
+        UniqueConstraint("direction", name="unique_direction_stats"),
+    )
@@ -0,0 +1,120 @@
+from typing import Optional
+
+from sqlalchemy import Float, Integer, String, select, func, literal, any_
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .base import DirectionStatsRepository
+from .models import DirectionStatsOrm
+from .schemas import DirectionStats
+from .exceptions import DirectionStatsRefreshError, DirectionStatsReadingError
+
+from ..applicants.models import ApplicantOrm
+from ..constants import BUDGET_PLACES_FOR_DIRECTIONS, POINTS_PERCENTILES
+
+# Колонки статистики, которые пересчитываются из конкурсного списка:
+STATS_COLUMNS = (
+    "direction",
+    "applicants_count",
+    "originals_count",
+    "min_points",
+    "max_points",
+    "avg_points",
+    "points_percentiles",
+    "budget_places",
+    "cutoff_rank",
+    "cutoff_points",
+    "cutoff_probability"
+)
+
+
+def get_budget_places(direction: str) -> Optional[int]:
+    budget_places = BUDGET_PLACES_FOR_DIRECTIONS.get(direction)
+    return budget_places if isinstance(budget_places, int) else None
+
+
+class SQLDirectionStatsRepository(DirectionStatsRepository):
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None) -> None:
+        self.session = session
+        self.read_session = read_session or session
+
+    async def refresh(self, directions: list[str]) -> int:
+        if not directions:
+            return 0
+        directions = sorted(set(directions))
+        budgets = (
+            func.unnest(
+                literal(directions, ARRAY(String)),
+                literal([get_budget_places(direction) for direction in directions], ARRAY(Integer))
+            )
+            .table_valued("direction", "budget_places")
+            .render_derived(name="budgets")
+        )
+        ranked = (
+            select(
+                ApplicantOrm.direction,
+                ApplicantOrm.rank,
+                ApplicantOrm.points,
+                ApplicantOrm.probability,
+                ApplicantOrm.original,
+                func.row_number().over(
+                    partition_by=ApplicantOrm.direction,
+                    order_by=(ApplicantOrm.rank, ApplicantOrm.id)
+                ).label("position")
+            )
+            .where(ApplicantOrm.direction == any_(literal(directions, ARRAY(String))))
+            .subquery()
+        )
+        at_cutoff = ranked.c.position == budgets.c.budget_places
+        stats = (
+            select(
+                budgets.c.direction,
+                func.count(),
+                func.count().filter(ranked.c.original),
+                func.min(ranked.c.points),
+                func.max(ranked.c.points),
+                func.avg(ranked.c.points),
+                func.percentile_cont(literal(list(POINTS_PERCENTILES), ARRAY(Float))).within_group(ranked.c.points),
+                budgets.c.budget_places,
+                func.max(ranked.c.rank).filter(at_cutoff),
+                func.max(ranked.c.points).filter(at_cutoff),
+                func.max(ranked.c.probability).filter(at_cutoff)
+            )
+            .select_from(ranked.join(budgets, ranked.c.direction == budgets.c.direction))
+            .group_by(budgets.c.direction, budgets.c.budget_places)
+        )
+        stmt = insert(DirectionStatsOrm).from_select(STATS_COLUMNS, stats)
+        stmt = stmt.on_conflict_do_update(
+            constraint="unique_direction_stats",
+            set_={
+                **{name: stmt.excluded[name] for name in STATS_COLUMNS if name != "direction"},
+                "updated_at": func.now()
+            }
+        )
+        try:
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DirectionStatsRefreshError(f"Error while refreshing direction stats: {e}") from e
+
+    async def read(self, direction: str) -> Optional[DirectionStats]:
+        try:
+            stmt = select(DirectionStatsOrm).where(DirectionStatsOrm.direction == direction)
+            result = await self.read_session.execute(stmt)
+            stats = result.scalar_one_or_none()
+            return DirectionStats.model_validate(stats) if stats else None
+        except SQLAlchemyError as e:
+            await self.read_session.rollback()
+            raise DirectionStatsReadingError(f"Error while reading direction stats: {e}") from e
+
+    async def read_all(self) -> list[DirectionStats]:
+        try:
+            stmt = select(DirectionStatsOrm).order_by(DirectionStatsOrm.direction)
+            results = await self.read_session.execute(stmt)
+            return [DirectionStats.model_validate(stats) for stats in results.scalars().all()]
+        except SQLAlchemyError as e:
+            await self.read_session.rollback()
+            raise DirectionStatsReadingError(f"Error while reading direction stats: {e}") from e
@@ -0,0 +1,59 @@
+from typing import Annotated
+
+from fastapi import APIRouter, status, HTTPException, Query
+
+from dishka.integrations.fastapi import DishkaRoute, FromDishka as Depends
+
+from .base import DirectionStatsRepository
+from .schemas import DirectionStats
+from .exceptions import DirectionStatsReadingError
+
+
+directions_router = APIRouter(
+    prefix="/api/v1/directions",
+    tags=["Directions"],
+    route_class=DishkaRoute
+)
+
+
+@directions_router.get(
+    path="/stats",
+    status_code=status.HTTP_200_OK,
+    response_model=DirectionStats,
+    summary="Возвращает статистику конкурсного списка направления подготовки"
+)
+async def get_direction_stats(
+        direction: Annotated[str, Query(..., description="Направление подготовки")],
+        direction_stats_repository: Depends[DirectionStatsRepository]
+) -> DirectionStats:
+    try:
+        stats = await direction_stats_repository.read(direction)
+    except DirectionStatsReadingError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error while receiving direction stats"
+        )
+    if not stats:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Direction stats not found"
+        )
+    return stats
+
+
+@directions_router.get(
+    path="/stats/all",
+    status_code=status.HTTP_200_OK,
+    response_model=list[DirectionStats],
+    summary="Возвращает статистику всех направлений подготовки"
+)
+async def get_all_direction_stats(
+        direction_stats_repository: Depends[DirectionStatsRepository]
+) -> list[DirectionStats]:
+    try:
+        return await direction_stats_repository.read_all()
+    except DirectionStatsReadingError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error while receiving direction stats"
+        )
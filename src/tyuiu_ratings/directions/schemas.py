@@ -0,0 +1,23 @@
+from typing import Optional
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DirectionStats(BaseModel):
+    """Статистика конкурсного списка направления подготовки"""
+    direction: str
+    applicants_count: int
+    originals_count: int  # Количество поданных оригиналов
+    min_points: int
+    max_points: int
+    avg_points: float
+    points_percentiles: list[float]  # Распределение баллов по POINTS_PERCENTILES
+    budget_places: Optional[int] = None  # None, если количество бюджетных мест неизвестно
+    cutoff_rank: Optional[int] = None  # Последний ранг в пределах бюджетных мест, None если все проходят
+    cutoff_points: Optional[int] = None  # Баллы абитуриента на проходной черте
+    cutoff_probability: Optional[float] = None  # Вероятность поступления на проходной черте
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,106 @@
+from typing import Any
+from collections.abc import AsyncIterator
+
+import logging
+from collections import Counter
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import aiohttp
+from pydantic import BaseModel
+from yarl import URL
+
+from .settings import HTTPSettings
+
+
+class PoolStats(BaseModel):
+    """Статистика пула HTTP-соединений"""
+    limit: int  # Максимальное количество соединений
+    limit_per_host: int  # Максимальное количество соединений к одному хосту
+    in_flight: int  # Запросы, выполняющиеся прямо сейчас
+    peak_in_flight: int  # Максимум одновременных запросов с момента запуска
+    in_flight_by_host: dict[str, int]
+    requests_total: int
+    connections_created: int  # Новые TCP соединения
+    connections_reused: int  # Запросы, обслуженные keep-alive соединением
+    connections_queued: int  # Сколько раз запрос ждал свободного соединения из пула
+
+
+class HTTPClient:
+    """Общий HTTP-клиент с пулом keep-alive соединений для внешних сервисов"""
+    def __init__(self, settings: HTTPSettings) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._in_flight_by_host: Counter[str] = Counter()
+        self._peak_in_flight = 0
+        self._requests_total = 0
+        self._connections_created = 0
+        self._connections_reused = 0
+        self._connections_queued = 0
+        self._connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            use_dns_cache=True,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT
+        )
+        self._session = aiohttp.ClientSession(
+            connector=self._connector,
+            timeout=aiohttp.ClientTimeout(
+                connect=settings.HTTP_CONNECT_TIMEOUT,
+                sock_read=settings.HTTP_READ_TIMEOUT
+            ),
+            trace_configs=[self._create_trace_config()]
+        )
+
+    @asynccontextmanager
+    async def post(self, url: str, **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        async with self._session.post(url, **kwargs) as response:
+            yield response
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            limit=self._connector.limit,
+            limit_per_host=self._connector.limit_per_host,
+            in_flight=sum(self._in_flight_by_host.values()),
+            peak_in_flight=self._peak_in_flight,
+            in_flight_by_host={host: count for host, count in self._in_flight_by_host.items() if count},
+            requests_total=self._requests_total,
+            connections_created=self._connections_created,
+            connections_reused=self._connections_reused,
+            connections_queued=self._connections_queued
+        )
+
+    async def close(self) -> None:
+        await self._session.close()
+        self.logger.info("HTTP client closed")
+
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_finish)
+        trace_config.on_request_exception.append(self._on_request_finish)
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        trace_config.on_connection_queued_start.append(self._on_connection_queued)
+        return trace_config
+
+    async def _on_request_start(self, _: aiohttp.ClientSession, __: SimpleNamespace, params: Any) -> None:
+        self._requests_total += 1
+        self._in_flight_by_host[self._host(params.url)] += 1
+        self._peak_in_flight = max(self._peak_in_flight, sum(self._in_flight_by_host.values()))
+
+    async def _on_request_finish(self, _: aiohttp.ClientSession, __: SimpleNamespace, params: Any) -> None:
+        self._in_flight_by_host[self._host(params.url)] -= 1
+
+    async def _on_connection_created(self, *_: Any) -> None:
+        self._connections_created += 1
+
+    async def _on_connection_reused(self, *_: Any) -> None:
+        self._connections_reused += 1
+
+    async def _on_connection_queued(self, *_: Any) -> None:
+        self._connections_queued += 1
+
+    @staticmethod
+    def _host(url: URL) -> str:
+        return f"{url.host}:{url.port}"
@@ -1,20 +1,36 @@
 from collections.abc import AsyncIterable
 
-from dishka import Provider, provide, Scope, from_context, make_async_container
+from dishka import AsyncContainer, Provider, provide, Scope, from_context, make_async_container
 
-from faststream.rabbit import RabbitBroker
+from faststream.rabbit import Channel, RabbitBroker
+
+from redis.asyncio import Redis
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from .database import create_session_factory
+from .base import TransactionManager
+from .database import ReadSession, ReplicaRouter, SQLTransactionManager, create_session_factory
+from .http_client import HTTPClient
+from .directions.mapping import DirectionsMapper, directions_mapper
+from .directions.base import DirectionStatsRepository
+from .directions.repository import SQLDirectionStatsRepository
 
-from .applicants.base import ApplicantRepository, ClassifierService, RecommendationService
+from .applicants.base import ApplicantRepository, SnapshotRepository, ClassifierService, RecommendationService
 from .applicants.use_cases import UpdateApplicantsUseCase, RecommendDirectionsUseCase
 from .applicants.rest import ClassifierAPI, RecommendationAPI
+from .applicants.ingest import (
+    SnapshotTracker,
+    ApplicantsCoalescer,
+    DirectionStatsRefreshHook,
+    CompetitionListInvalidationHook
+)
+from .applicants.cache import CompetitionListCache, ChangeLogVersions
+from .applicants.deltas import DeltaHub
+from .applicants.classifier import ChunkedClassifier, CachingClassifier, DeduplicatingClassifier
 from .notifications.use_cases import BroadcastNotificationsUseCase
 from .profiles.base import ProfileRepository
 from .ratings.base import RatingRepository
-from .applicants.repository import SQLApplicantRepository
+from .applicants.repository import SQLApplicantRepository, SQLSnapshotRepository
 from .profiles.repository import SQLProfileRepository
 from .ratings.repository import SQLRatingRepository
 
@@ -26,48 +42,151 @@ class AppProvider(Provider):
 
     @provide(scope=Scope.APP)
     def get_rabbit_broker(self, config: Settings) -> RabbitBroker:
-        return RabbitBroker(config.rabbit.rabbit_url)
+        # Подписчики открывают канал брокера, поэтому предел неподтверждённых сообщений задаётся здесь
+        return RabbitBroker(
+            config.rabbit.rabbit_url,
+            default_channel=Channel(prefetch_count=config.rabbit.RABBIT_PREFETCH_COUNT)
+        )
 
     @provide(scope=Scope.APP)
     def get_session_factory(self, config: Settings) -> async_sessionmaker[AsyncSession]:
         return create_session_factory(config.postgres)
 
+    @provide(scope=Scope.APP)
+    def get_directions_mapper(self) -> DirectionsMapper:
+        return directions_mapper
+
+    @provide(scope=Scope.APP)
+    def get_snapshot_tracker(
+            self,
+            container: AsyncContainer,
+            competition_list_cache: CompetitionListCache,
+            delta_hub: DeltaHub
+    ) -> SnapshotTracker:
+        snapshot_tracker = SnapshotTracker(container)
+        snapshot_tracker.add_hook(DirectionStatsRefreshHook(container))
+        snapshot_tracker.add_hook(CompetitionListInvalidationHook(competition_list_cache, delta_hub))
+        return snapshot_tracker
+
+    @provide(scope=Scope.APP)
+    def get_competition_list_cache(self) -> CompetitionListCache:
+        return CompetitionListCache()
+
+    @provide(scope=Scope.APP)
+    def get_change_log_versions(self) -> ChangeLogVersions:
+        return ChangeLogVersions()
+
+    @provide(scope=Scope.APP)
+    def get_delta_hub(self, broker: RabbitBroker) -> DeltaHub:
+        return DeltaHub(broker)
+
+    @provide(scope=Scope.APP)
+    def get_applicants_coalescer(self, config: Settings, container: AsyncContainer) -> ApplicantsCoalescer:
+        return ApplicantsCoalescer(
+            container=container,
+            max_concurrent_batches=config.rabbit.RABBIT_CONSUMER_CONCURRENCY
+        )
+
+    @provide(scope=Scope.APP)
+    async def get_replica_router(self, config: Settings) -> AsyncIterable[ReplicaRouter]:
+        replica_router = ReplicaRouter(config.postgres.replica_urls, max_lag=config.postgres.PG_MAX_REPLICA_LAG)
+        yield replica_router
+        await replica_router.close()
+
     @provide(scope=Scope.REQUEST)
     async def get_session(self, session_factory: async_sessionmaker[AsyncSession]) -> AsyncIterable[AsyncSession]:
         async with session_factory() as session:
             yield session
 
     @provide(scope=Scope.REQUEST)
-    def get_applicant_repository(self, session: AsyncSession) -> ApplicantRepository:
-        return SQLApplicantRepository(session)
+    async def get_read_session(
+            self,
+            replica_router: ReplicaRouter,
+            session: AsyncSession
+    ) -> AsyncIterable[ReadSession]:
+        session_factory = await replica_router.get_session_factory()
+        if session_factory is None:
+            yield ReadSession(session)
+            return
+        async with session_factory() as read_session:
+            yield ReadSession(read_session)
+
+    @provide(scope=Scope.REQUEST)
+    def get_transaction_manager(self, session: AsyncSession) -> TransactionManager:
+        return SQLTransactionManager(session)
+
+    @provide(scope=Scope.REQUEST)
+    def get_applicant_repository(self, session: AsyncSession, read_session: ReadSession) -> ApplicantRepository:
+        return SQLApplicantRepository(session, read_session)
+
+    @provide(scope=Scope.REQUEST)
+    def get_snapshot_repository(self, session: AsyncSession) -> SnapshotRepository:
+        return SQLSnapshotRepository(session)
+
+    @provide(scope=Scope.REQUEST)
+    def get_profile_repository(self, session: AsyncSession, read_session: ReadSession) -> ProfileRepository:
+        return SQLProfileRepository(session, read_session)
 
     @provide(scope=Scope.REQUEST)
-    def get_profile_repository(self, session: AsyncSession) -> ProfileRepository:
-        return SQLProfileRepository(session)
+    def get_rating_repository(self, session: AsyncSession, read_session: ReadSession) -> RatingRepository:
+        return SQLRatingRepository(session, read_session)
 
     @provide(scope=Scope.REQUEST)
-    def get_rating_repository(self, session: AsyncSession) -> RatingRepository:
-        return SQLRatingRepository(session)
+    def get_direction_stats_repository(
+            self,
+            session: AsyncSession,
+            read_session: ReadSession
+    ) -> DirectionStatsRepository:
+        return SQLDirectionStatsRepository(session, read_session)
+
+    @provide(scope=Scope.APP)
+    async def get_http_client(self, config: Settings) -> AsyncIterable[HTTPClient]:
+        http_client = HTTPClient(config.http)
+        yield http_client
+        await http_client.close()
 
     @provide(scope=Scope.APP)
-    def get_classifier_service(self, config: Settings) -> ClassifierService:
-        return ClassifierAPI(config.api.CLASSIFIER_URL)
+    async def get_caching_classifier(
+            self,
+            config: Settings,
+            http_client: HTTPClient
+    ) -> AsyncIterable[CachingClassifier]:
+        redis = Redis.from_url(config.redis.redis_url) if config.redis.is_configured else None
+        yield CachingClassifier(
+            ChunkedClassifier(ClassifierAPI(config.api.CLASSIFIER_URL, http_client)),
+            redis=redis,
+            model_version=config.api.CLASSIFIER_MODEL_VERSION
+        )
+        if redis is not None:
+            await redis.close()
 
     @provide(scope=Scope.APP)
-    def get_recommendation_service(self, config: Settings) -> RecommendationService:
-        return RecommendationAPI(config.api.REC_SYS_URL)
+    def get_classifier_service(self, caching_classifier: CachingClassifier) -> ClassifierService:
+        return DeduplicatingClassifier(caching_classifier)
+
+    @provide(scope=Scope.APP)
+    def get_recommendation_service(self, config: Settings, http_client: HTTPClient) -> RecommendationService:
+        return RecommendationAPI(config.api.REC_SYS_URL, http_client)
 
     @provide(scope=Scope.REQUEST)
     def get_update_applicants_use_case(
             self,
             classifier_service: ClassifierService,
             applicant_repository: ApplicantRepository,
-            rating_repository: RatingRepository
+            rating_repository: RatingRepository,
+            transaction_manager: TransactionManager,
+            competition_list_cache: CompetitionListCache,
+            change_log_versions: ChangeLogVersions,
+            delta_hub: DeltaHub
     ) -> UpdateApplicantsUseCase:
         return UpdateApplicantsUseCase(
             classifier_service=classifier_service,
             applicant_repository=applicant_repository,
-            rating_repository=rating_repository
+            rating_repository=rating_repository,
+            transaction_manager=transaction_manager,
+            competition_list_cache=competition_list_cache,
+            change_log_versions=change_log_versions,
+            delta_hub=delta_hub
         )
 
     @provide(scope=Scope.REQUEST)
@@ -0,0 +1,77 @@
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, status, Query
+
+from dishka.integrations.fastapi import DishkaRoute, FromDishka as Depends
+
+from ..database import ReplicaRouter, ReplicaStats
+from ..http_client import HTTPClient, PoolStats
+from ..applicants.cache import CompetitionListCache
+from ..applicants.classifier import CachingClassifier
+from ..applicants.dto import PredictionsCacheStats, CompetitionListCacheStats
+
+
+monitoring_router = APIRouter(
+    prefix="/api/v1/monitoring",
+    tags=["Monitoring"],
+    route_class=DishkaRoute
+)
+
+
+@monitoring_router.get(
+    path="/http-pool",
+    status_code=status.HTTP_200_OK,
+    response_model=PoolStats,
+    summary="Возвращает статистику пула HTTP-соединений к внешним сервисам"
+)
+async def get_http_pool_stats(http_client: Depends[HTTPClient]) -> PoolStats:
+    return http_client.stats()
+
+
+@monitoring_router.get(
+    path="/predictions-cache",
+    status_code=status.HTTP_200_OK,
+    response_model=PredictionsCacheStats,
+    summary="Возвращает статистику кеша предсказаний классификатора"
+)
+async def get_predictions_cache_stats(caching_classifier: Depends[CachingClassifier]) -> PredictionsCacheStats:
+    return caching_classifier.stats()
+
+
+@monitoring_router.post(
+    path="/predictions-cache/flush",
+    status_code=status.HTTP_200_OK,
+    response_model=PredictionsCacheStats,
+    summary="Очищает кеш предсказаний, например после обновления модели классификатора"
+)
+async def flush_predictions_cache(
+        caching_classifier: Depends[CachingClassifier],
+        model_version: Annotated[
+            Optional[str],
+            Query(description="Новая версия модели классификатора")
+        ] = None
+) -> PredictionsCacheStats:
+    await caching_classifier.flush(model_version)
+    return caching_classifier.stats()
+
+
+@monitoring_router.get(
+    path="/competition-lists-cache",
+    status_code=status.HTTP_200_OK,
+    response_model=CompetitionListCacheStats,
+    summary="Возвращает статистику кеша конкурсных списков"
+)
+async def get_competition_lists_cache_stats(
+        competition_list_cache: Depends[CompetitionListCache]
+) -> CompetitionListCacheStats:
+    return competition_list_cache.stats()
+
+
+@monitoring_router.get(
+    path="/replicas",
+    status_code=status.HTTP_200_OK,
+    response_model=list[ReplicaStats],
+    summary="Возвращает отставание реплик Postgres, используемых для чтения"
+)
+async def get_replicas_stats(replica_router: Depends[ReplicaRouter]) -> list[ReplicaStats]:
+    return replica_router.stats()
@@ -2,7 +2,7 @@ from typing import Optional
 
 from ..profiles.base import ProfileRepository
 from ..applicants.dto import CreatedApplicant
-from ..ratings.schemas import Rating
+from ..ratings.dto import RatingFeatures
 
 from .schemas import Notification
 from .rules import (
@@ -19,7 +19,7 @@ class NotificationFactory:
     async def create_notification(
             self,
             applicant: CreatedApplicant,
-            ratings: list[Rating]
+            features: RatingFeatures
     ) -> Optional[Notification]:
         profile = await self._profile_repository.get_by_applicant_id(applicant.applicant_id)
         if not profile:
@@ -29,7 +29,7 @@ class NotificationFactory:
                 CriticalConditionalHandler(None)
             )
         )
-        condition_result = condition_chain.check(applicant, ratings)
+        condition_result = condition_chain.check(applicant, features)
         return Notification(
             level=condition_result.level,
             user_id=profile.user_id,
@@ -6,12 +6,10 @@ from pydantic import BaseModel
 
 from .enums import NotificationLevel
 
-from ..ratings.schemas import Rating
+from ..ratings.dto import RatingFeatures
 from ..applicants.dto import CreatedApplicant
-from ..utils import is_rating_stable, calculate_velocity
 from ..constants import (
     MAX_CHANGE,
-    DAYS_COUNT,
     TOP_RATING,
     THRESHOLD_VELOCITY,
     BUDGET_PLACES_FOR_DIRECTIONS,
@@ -34,7 +32,7 @@ class ConditionalHandler(ABC):
     def check(
             self,
             applicant: CreatedApplicant,
-            ratings: list[Rating]
+            features: RatingFeatures
     ) -> Optional[ConditionalResult]:
         """Логика проверки условия для формирования уведомления."""
         pass
@@ -42,13 +40,13 @@ class ConditionalHandler(ABC):
     async def handle(
             self,
             applicant: CreatedApplicant,
-            ratings: list[Rating]
+            features: RatingFeatures
     ) -> Optional[ConditionalResult]:
-        result = self.check(applicant, ratings)
+        result = self.check(applicant, features)
         if result:
             return result
         if self.next_handler:
-            return self.next_handler.handle(applicant, ratings)
+            return self.next_handler.handle(applicant, features)
         return None
 
 
@@ -56,9 +54,9 @@ class PositiveConditionalHandler(ConditionalHandler):
     def check(
             self,
             applicant: CreatedApplicant,
-            ratings: list[Rating]
+            features: RatingFeatures
     ) -> Optional[ConditionalResult]:
-        if self._high_probability(applicant) and self._rating_stable(applicant, ratings):
+        if self._high_probability(applicant) and self._rating_stable(applicant, features):
             return ConditionalResult(
                 level=NotificationLevel.POSITIVE,
                 message=...
@@ -73,22 +71,19 @@ class PositiveConditionalHandler(ConditionalHandler):
             - WARNING_BUDGET_ZONE_THRESHOLD
 
     @staticmethod
-    def _rating_stable(applicant: CreatedApplicant, ratings: list[Rating]) -> bool:
+    def _rating_stable(applicant: CreatedApplicant, features: RatingFeatures) -> bool:
         """Рейтинг стабилен последние N дней"""
-        return is_rating_stable(
-            ratings=ratings,
-            days_count=DAYS_COUNT,
-            max_change=MAX_CHANGE
-        ) and applicant.rank <= TOP_RATING
+        return (features.max_change is None or features.max_change <= MAX_CHANGE) \
+            and applicant.rank <= TOP_RATING
 
 
 class WarningConditionalHandler(ConditionalHandler):
     def check(
             self,
             applicant: CreatedApplicant,
-            ratings: list[Rating]
+            features: RatingFeatures
     ) -> Optional[ConditionalResult]:
-        if self._fast_rating_decrease_conditional(ratings) or self._in_warning_zone_conditional(applicant):
+        if self._fast_rating_decrease_conditional(features) or self._in_warning_zone_conditional(applicant):
             return ConditionalResult(
                 level=NotificationLevel.WARNING,
                 message=...
@@ -96,9 +91,9 @@ class WarningConditionalHandler(ConditionalHandler):
         return None
 
     @staticmethod
-    def _fast_rating_decrease_conditional(ratings: list[Rating]) -> bool:
+    def _fast_rating_decrease_conditional(features: RatingFeatures) -> bool:
         """Быстрое падание в рейтинге за последний день"""
-        return calculate_velocity(ratings)[-1] <= THRESHOLD_VELOCITY
+        return features.velocity <= THRESHOLD_VELOCITY
 
     @staticmethod
     def _in_warning_zone_conditional(applicant: CreatedApplicant) -> bool:
@@ -111,7 +106,7 @@ class CriticalConditionalHandler(ConditionalHandler):
     def check(
             self,
             applicant: CreatedApplicant,
-            ratings: list[Rating]
+            features: RatingFeatures
     ) -> Optional[ConditionalResult]:
         if self._low_probability_conditional(applicant) or self._not_in_budget_zone_conditional(applicant):
             return ConditionalResult(
@@ -10,7 +10,14 @@ from dishka import Scope
 from .use_cases import BroadcastNotificationsUseCase
 
 from ..ioc import container
-from ..constants import CURRENT_TIMEZONE, BROADCAST_HOURS, BROADCAST_MINUTES
+from ..applicants.tasks import prune_applicant_changes_task, prune_snapshots_task
+from ..constants import (
+    CURRENT_TIMEZONE,
+    BROADCAST_HOURS,
+    BROADCAST_MINUTES,
+    CHANGE_LOG_PRUNE_HOURS,
+    CHANGE_LOG_PRUNE_MINUTES
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,4 +39,12 @@ def create_scheduler_app() -> AsyncIOScheduler:
         broadcast_notifications_task,
         CronTrigger(hour=BROADCAST_HOURS, minute=BROADCAST_MINUTES, timezone=timezone)
     )
+    scheduler.add_job(
+        prune_applicant_changes_task,
+        CronTrigger(hour=CHANGE_LOG_PRUNE_HOURS, minute=CHANGE_LOG_PRUNE_MINUTES, timezone=timezone)
+    )
+    scheduler.add_job(
+        prune_snapshots_task,
+        CronTrigger(hour=CHANGE_LOG_PRUNE_HOURS, minute=CHANGE_LOG_PRUNE_MINUTES, timezone=timezone)
+    )
     return scheduler
@@ -1,20 +1,19 @@
-from typing import Protocol, Optional
+from typing import Protocol
 from collections.abc import AsyncIterator
 
 import asyncio
 
 from pydantic import BaseModel
 
-from .schemas import Notification
 from .factory import NotificationFactory
 
 from ..applicants.base import ApplicantRepository
 from ..applicants.dto import CreatedApplicant
 from ..profiles.base import ProfileRepository
 from ..ratings.base import RatingRepository
+from ..ratings.dto import RatingFeatures
 
-from ..utils import calculate_pages
-from ..constants import DEFAULT_LIMIT, NOTIFICATIONS_QUEUE
+from ..constants import NOTIFICATIONS_QUEUE
 
 
 class BaseBroker(Protocol):
@@ -39,28 +38,23 @@ class BroadcastNotificationsUseCase:
         self._broker = broker
 
     async def __call__(self) -> None:
-        async for applicants in self._iterate_applicants():
-            tasks = [self._send(applicant) for applicant in applicants]
+        async for batch in self._iterate_features():
+            tasks = [self._send(applicant, features) for applicant, features in batch]
             await asyncio.gather(*tasks)
 
-    async def _iterate_applicants(self) -> AsyncIterator[list[CreatedApplicant]]:
-        total_count = await self._applicant_repository.count()
-        pages = calculate_pages(total_count, DEFAULT_LIMIT)
-        for page in range(1, pages + 1):
-            applicants = await self._applicant_repository.paginate(page, DEFAULT_LIMIT)
-            yield applicants
-
-    async def _prepare_notification(self, applicant: CreatedApplicant) -> Optional[Notification]:
-        ratings = await self._rating_repository.read(
-            applicant_id=applicant.applicant_id,
-            direction=applicant.direction
-        )
+    async def _iterate_features(self) -> AsyncIterator[list[tuple[CreatedApplicant, RatingFeatures]]]:
+        """Отдаёт пачки абитуриентов вместе с признаками их рейтинга, посчитанными в БД"""
+        async for features in self._rating_repository.stream_features():
+            features_by_key = {(feature.applicant_id, feature.direction): feature for feature in features}
+            applicants = await self._applicant_repository.get_applicants_by_keys(list(features_by_key))
+            yield [
+                (applicant, features_by_key[(applicant.applicant_id, applicant.direction)])
+                for applicant in applicants
+            ]
+
+    async def _send(self, applicant: CreatedApplicant, features: RatingFeatures) -> None:
         notification = await self._notification_factory.create_notification(
             applicant=applicant,
-            ratings=ratings
+            features=features
         )
-        return notification
-
-    async def _send(self, applicant: CreatedApplicant) -> None:
-        notification = await self._prepare_notification(applicant)
         await self._broker.publish(notification, queue=NOTIFICATIONS_QUEUE)
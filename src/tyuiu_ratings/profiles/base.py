@@ -11,6 +11,8 @@ from uuid import UUID
 from .schemas import Profile
 from .dto import CreatedProfile
 
+from ..types import Row
+
 
 class ProfileRepository(ABC):
     @abstractmethod
@@ -33,3 +35,14 @@ class ProfileRepository(ABC):
 
     @abstractmethod
     async def get_ratings(self, user_id: UUID, direction: str) -> list["Rating"]: pass
+
+    @abstractmethod
+    async def get_applicants_rows(self, user_id: UUID) -> list[Row]: pass
+
+    @abstractmethod
+    async def get_ratings_rows(self, user_id: UUID, direction: str) -> list[Row]: pass
+
+    @abstractmethod
+    async def get_ratings_version(self, user_id: UUID, direction: str) -> Optional[int]:
+        """Версия истории рейтинга по сводке, None если сводки ещё нет"""
+        pass
@@ -28,6 +28,7 @@ class ExamOrm(Base):
     profile: Mapped["ProfileOrm"] = relationship(back_populates="exams")
 
     __table_args__ = (
+        Index("ix_exams_applicant_id", "applicant_id"),
         CheckConstraint(
             f"points BETWEEN {MIN_EXAM_POINTS} AND {MAX_EXAM_POINTS}",
             "check_exam_points_range"
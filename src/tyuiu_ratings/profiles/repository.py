@@ -23,11 +23,15 @@ from .exceptions import (
     ProfileDeletingError
 )
 
+from ..types import Row
+from ..utils import timestamp_version
+
 
 class SQLProfileRepository(ProfileRepository):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None) -> None:
         self.logger = logging.getLogger(self.__class__.__name__)
         self.session = session
+        self.read_session = read_session or session
 
     async def create(self, profile: Profile) -> CreatedProfile:
         try:
@@ -130,11 +134,11 @@ class SQLProfileRepository(ProfileRepository):
                 select(ProfileOrm)
                 .where(ProfileOrm.applicant_id == applicant_id)
             )
-            result = await self.session.execute(stmt)
+            result = await self.read_session.execute(stmt)
             profile = result.scalar_one_or_none()
             return CreatedProfile.model_validate(profile) if profile else None
         except SQLAlchemyError as e:
-            await self.session.rollback()
+            await self.read_session.rollback()
             raise ProfileReadingError(f"Error while reading profile: {e}") from e
 
     async def get_applicants(self, user_id: UUID) -> list["CreatedApplicant"]:
@@ -146,11 +150,11 @@ class SQLProfileRepository(ProfileRepository):
                 .join(ProfileOrm, ApplicantOrm.applicant_id == ProfileOrm.applicant_id)
                 .where(ProfileOrm.user_id == user_id)
             )
-            results = await self.session.execute(stmt)
+            results = await self.read_session.execute(stmt)
             applicants = results.scalars().all()
             return [CreatedApplicant.model_validate(applicant) for applicant in applicants]
         except SQLAlchemyError as e:
-            await self.session.rollback()
+            await self.read_session.rollback()
             self.logger.error(f"Error while reading applicants: {e}")
             raise ProfileReadingError(f"Error while reading applicants: {e}") from e
 
@@ -166,10 +170,63 @@ class SQLProfileRepository(ProfileRepository):
                     RatingOrm.direction == direction
                 )
             )
-            results = await self.session.execute(stmt)
+            results = await self.read_session.execute(stmt)
             ratings = results.scalars().all()
             return [Rating.model_validate(rating) for rating in ratings]
+        except SQLAlchemyError as e:
+            await self.read_session.rollback()
+            self.logger.error(f"Error while receiving ratings: {e}")
+            raise ProfileReadingError(f"Error while receiving ratings: {e}") from e
+
+    async def get_applicants_rows(self, user_id: UUID) -> list[Row]:
+        from ..applicants.models import ApplicantOrm
+        from ..applicants.repository import CREATED_APPLICANT_COLUMNS
+        try:
+            stmt = (
+                select(*CREATED_APPLICANT_COLUMNS)
+                .join(ProfileOrm, ApplicantOrm.applicant_id == ProfileOrm.applicant_id)
+                .where(ProfileOrm.user_id == user_id)
+            )
+            results = await self.read_session.execute(stmt)
+            return [dict(row) for row in results.mappings()]
+        except SQLAlchemyError as e:
+            await self.read_session.rollback()
+            self.logger.error(f"Error while reading applicants: {e}")
+            raise ProfileReadingError(f"Error while reading applicants: {e}") from e
+
+    async def get_ratings_rows(self, user_id: UUID, direction: str) -> list[Row]:
+        from ..ratings.models import RatingOrm
+        from ..ratings.repository import RATING_RESPONSE_COLUMNS
+        try:
+            stmt = (
+                select(*RATING_RESPONSE_COLUMNS)
+                .join(ProfileOrm, RatingOrm.applicant_id == ProfileOrm.applicant_id)
+                .where(
+                    ProfileOrm.user_id == user_id,
+                    RatingOrm.direction == direction
+                )
+            )
+            results = await self.session.execute(stmt)
+            return [dict(row) for row in results.mappings()]
         except SQLAlchemyError as e:
             await self.session.rollback()
             self.logger.error(f"Error while receiving ratings: {e}")
             raise ProfileReadingError(f"Error while receiving ratings: {e}") from e
+
+    async def get_ratings_version(self, user_id: UUID, direction: str) -> Optional[int]:
+        from ..ratings.models import RatingSummaryOrm
+        try:
+            stmt = (
+                select(RatingSummaryOrm.updated_at)
+                .join(ProfileOrm, RatingSummaryOrm.applicant_id == ProfileOrm.applicant_id)
+                .where(
+                    ProfileOrm.user_id == user_id,
+                    RatingSummaryOrm.direction == direction
+                )
+            )
+            updated_at = await self.session.scalar(stmt)
+            return timestamp_version(updated_at) if updated_at is not None else None
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            self.logger.error(f"Error while receiving ratings version: {e}")
+            raise ProfileReadingError(f"Error while receiving ratings version: {e}") from e
@@ -1,8 +1,8 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 from uuid import UUID
 
-from fastapi import APIRouter, status, HTTPException, Query
+from fastapi import APIRouter, status, HTTPException, Query, Header, Response
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka as Depends
 
@@ -18,6 +18,7 @@ from .exceptions import (
 
 from ..applicants.dto import CreatedApplicant
 from ..ratings.schemas import Rating
+from ..responses import ORJSONBytesResponse, make_etag, cache_headers, not_modified
 
 
 profiles_router = APIRouter(
@@ -134,15 +135,15 @@ async def delete_profile(
 async def get_applicants(
         user_id: UUID,
         profile_repository: Depends[ProfileRepository]
-) -> list[CreatedApplicant]:
+) -> ORJSONBytesResponse:
     try:
-        applicants = await profile_repository.get_applicants(user_id)
+        applicants = await profile_repository.get_applicants_rows(user_id)
         if not applicants:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Not applicants yet"
             )
-        return applicants
+        return ORJSONBytesResponse(applicants)
     except ProfileReadingError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -160,16 +161,24 @@ async def get_applicants(
 async def get_rating_history(
         user_id: UUID,
         direction: Annotated[str, Query(..., description="Направление подготовки")],
-        profile_repository: Depends[ProfileRepository]
-) -> list[Rating]:
+        profile_repository: Depends[ProfileRepository],
+        if_none_match: Annotated[Optional[str], Header()] = None
+) -> Response:
     try:
-        ratings = await profile_repository.get_ratings(user_id, direction)
+        version = await profile_repository.get_ratings_version(user_id, direction)
+        etag = make_etag(version) if version is not None else None
+        if etag is not None and (response := not_modified(if_none_match, etag, scope="private")) is not None:
+            return response
+        ratings = await profile_repository.get_ratings_rows(user_id, direction)
         if not ratings:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Not ratings yet"
             )
-        return ratings
+        return ORJSONBytesResponse(
+            ratings,
+            headers=cache_headers(etag, scope="private") if etag is not None else None
+        )
     except ProfileReadingError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
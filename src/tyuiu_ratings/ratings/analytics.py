@@ -0,0 +1,160 @@
+from typing import NamedTuple, Optional
+
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .schemas import Rating
+
+from ..constants import DAYS_COUNT, MAX_CHANGE
+
+# Единица хранения дат рейтинга в массивах
+DATE_UNIT = "us"
+
+
+class RatingHistories(NamedTuple):
+    """Истории рейтингов многих пар (applicant_id, direction) в плоских массивах.
+    Ряд i занимает срез [offsets[i], offsets[i + 1]) в ranks и dates в исходном порядке.
+    """
+    ranks: np.ndarray  # float64
+    dates: np.ndarray  # datetime64[us]
+    offsets: np.ndarray  # int64, длина — количество рядов + 1
+
+    @classmethod
+    def from_ratings(cls, histories: Iterable[list[Rating]]) -> "RatingHistories":
+        ranks: list[int] = []
+        dates: list[datetime] = []
+        offsets = [0]
+        for ratings in histories:
+            for rating in ratings:
+                ranks.append(rating.rank)
+                dates.append(_naive_utc(rating.date))
+            offsets.append(len(ranks))
+        return cls(
+            ranks=np.array(ranks, dtype=np.float64),
+            dates=np.array(dates, dtype=f"datetime64[{DATE_UNIT}]"),
+            offsets=np.array(offsets, dtype=np.int64)
+        )
+
+    @property
+    def size(self) -> int:
+        """Количество рядов"""
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def series_ids(self) -> np.ndarray:
+        """Номер ряда для каждого элемента плоских массивов"""
+        return np.repeat(np.arange(self.size), self.lengths)
+
+
+class RatingMetrics(NamedTuple):
+    """Метрики рейтингов, рассчитанные за один проход по всем рядам"""
+    velocity: np.ndarray  # Плоский, как ranks: изменение позиции к предыдущему дню
+    acceleration: np.ndarray  # Плоский, как ranks: изменение velocity к предыдущему дню
+    mean_velocity: np.ndarray  # По рядам
+    stability: np.ndarray  # По рядам: выборочное стандартное отклонение rank, NaN при одном дне
+    max_change: np.ndarray  # По рядам: максимальное |Δrank| за последние days_count дней, NaN если дней < 2
+    stable: np.ndarray  # По рядам: max_change <= допустимого или дней в окне < 2
+
+
+def _naive_utc(date: datetime) -> datetime:
+    if date.tzinfo is None:
+        return date
+    return date.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _segment_sum(values: np.ndarray, histories: RatingHistories) -> np.ndarray:
+    """Сумма по рядам. Ряды одной длины складываются построчно в матрице,
+    чтобы порядок суммирования совпадал с np.sum, который использует pandas.
+    """
+    lengths = histories.lengths
+    sums = np.zeros(histories.size, dtype=np.float64)
+    for length in np.unique(lengths[lengths > 0]):
+        series = np.flatnonzero(lengths == length)
+        rows = histories.offsets[series][:, np.newaxis] + np.arange(length)
+        sums[series] = values[rows].sum(axis=1)
+    return sums
+
+
+def _rank_changes(histories: RatingHistories) -> np.ndarray:
+    """Δrank к предыдущему дню ряда, 0 для первого дня"""
+    changes = np.zeros_like(histories.ranks)
+    changes[1:] = histories.ranks[1:] - histories.ranks[:-1]
+    changes[histories.offsets[:-1][histories.lengths > 0]] = 0
+    return changes
+
+
+def calculate_velocities(histories: RatingHistories) -> np.ndarray:
+    return -_rank_changes(histories)
+
+
+def calculate_accelerations(histories: RatingHistories, changes: Optional[np.ndarray] = None) -> np.ndarray:
+    changes = _rank_changes(histories) if changes is None else changes
+    accelerations = np.zeros_like(changes)
+    accelerations[1:] = -(changes[1:] - changes[:-1])
+    accelerations[histories.offsets[:-1][histories.lengths > 0]] = 0
+    return accelerations
+
+
+def calculate_mean_velocities(histories: RatingHistories, changes: Optional[np.ndarray] = None) -> np.ndarray:
+    changes = _rank_changes(histories) if changes is None else changes
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return -(_segment_sum(changes, histories) / histories.lengths)
+
+
+def calculate_stabilities(histories: RatingHistories) -> np.ndarray:
+    """Выборочное стандартное отклонение (ddof=1) rank по рядам"""
+    lengths = histories.lengths
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = _segment_sum(histories.ranks, histories) / lengths
+        squares = (np.repeat(means, lengths) - histories.ranks) ** 2
+        variances = _segment_sum(squares, histories) / (lengths - 1)
+    variances[lengths < 2] = np.nan
+    return np.sqrt(variances)
+
+
+def calculate_max_changes(histories: RatingHistories, days_count: int = DAYS_COUNT) -> np.ndarray:
+    """Максимальное |Δrank| между соседними днями ряда, попавшими в последние days_count дней"""
+    series_ids = histories.series_ids
+    dates = histories.dates.view(np.int64)
+    last_dates = np.full(histories.size, np.iinfo(np.int64).min)
+    np.maximum.at(last_dates, series_ids, dates)
+    cutoff = last_dates - np.timedelta64(days_count, "D").astype(f"timedelta64[{DATE_UNIT}]").view(np.int64)
+    in_window = dates >= cutoff[series_ids]
+    window_ranks, window_series_ids = histories.ranks[in_window], series_ids[in_window]
+    same_series = window_series_ids[1:] == window_series_ids[:-1]
+    max_changes = np.full(histories.size, -np.inf)
+    np.maximum.at(
+        max_changes,
+        window_series_ids[1:][same_series],
+        np.abs(np.diff(window_ranks))[same_series]
+    )
+    max_changes[np.isneginf(max_changes)] = np.nan
+    return max_changes
+
+
+def calculate_stable(max_changes: np.ndarray, max_change: int = MAX_CHANGE) -> np.ndarray:
+    return np.isnan(max_changes) | (max_changes <= max_change)
+
+
+def analyze_ratings(
+        histories: RatingHistories,
+        days_count: int = DAYS_COUNT,
+        max_change: int = MAX_CHANGE
+) -> RatingMetrics:
+    """Рассчитывает все метрики рейтингов для всех рядов векторно"""
+    changes = _rank_changes(histories)
+    max_changes = calculate_max_changes(histories, days_count)
+    return RatingMetrics(
+        velocity=-changes,
+        acceleration=calculate_accelerations(histories, changes),
+        mean_velocity=calculate_mean_velocities(histories, changes),
+        stability=calculate_stabilities(histories),
+        max_change=max_changes,
+        stable=calculate_stable(max_changes, max_change)
+    )
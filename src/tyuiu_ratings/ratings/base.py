@@ -1,12 +1,24 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 from .schemas import Rating
-from .dto import RatingCreation
+from .dto import RatingCreation, RatingFeatures
+
+from ..constants import DAYS_COUNT, RATING_FEATURES_BATCH_SIZE
 
 
 class RatingRepository(ABC):
     @abstractmethod
     async def bulk_upsert(self, ratings: list[RatingCreation]) -> None: pass
 
+    @abstractmethod
+    async def load_snapshot(self, ratings: list[RatingCreation], commit: bool = True) -> int: pass
+
     @abstractmethod
     async def read(self, applicant_id: int, direction: str) -> list[Rating]: pass
+
+    @abstractmethod
+    async def rebuild_summary(self, days_count: int = DAYS_COUNT) -> int: pass
+
+    @abstractmethod
+    def stream_features(self, batch_size: int = RATING_FEATURES_BATCH_SIZE) -> AsyncIterator[list[RatingFeatures]]: pass
@@ -1,6 +1,8 @@
+from typing import Optional
+
 from datetime import datetime
 
-from pydantic import Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from .schemas import Rating
 
@@ -10,3 +12,17 @@ class RatingCreation(Rating):
     applicant_id: int  # Уникальный ID абитуриента
     direction: str  # Направление подготовки
     date: datetime = Field(default_factory=datetime.today)
+
+
+class RatingFeatures(BaseModel):
+    """Признаки истории рейтинга абитуриента на направлении для правил уведомлений"""
+    applicant_id: int  # Уникальный ID абитуриента
+    direction: str  # Направление подготовки
+    days: int  # Количество дней в истории
+    velocity: float  # Изменение позиции за последний день
+    acceleration: float  # Изменение velocity за последний день
+    ewma_velocity: float  # Экспоненциально сглаженное изменение позиции
+    stability: Optional[float]  # Стандартное отклонение позиции, None при одном дне
+    max_change: Optional[float]  # Максимальное изменение позиции за DAYS_COUNT дней, None если дней меньше двух
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,6 +1,9 @@
+from typing import Optional
+
 from datetime import datetime
 
-from sqlalchemy import DateTime, UniqueConstraint
+from sqlalchemy import DateTime, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..database import Base
@@ -17,3 +20,27 @@ class RatingOrm(Base):
     __table_args__ = (
         UniqueConstraint("applicant_id", "direction", "date", name="unique_rating"),
     )
+
+
+class RatingSummaryOrm(Base):
+    """Сводка истории рейтинга (applicant_id, direction), обновляется в транзакции загрузки среза"""
+    __tablename__ = "rating_summary"
+
+    applicant_id: Mapped[int] = mapped_column(nullable=False)
+    direction: Mapped[str] = mapped_column(nullable=False)
+    days: Mapped[int]  # Количество срезов в истории
+    last_rank: Mapped[int]
+    last_date: Mapped[datetime] = mapped_column(DateTime)
+    previous_rank: Mapped[Optional[int]]
+    velocity: Mapped[float]  # Изменение позиции за последний срез
+    acceleration: Mapped[float]  # Изменение velocity за последний срез
+    ewma_velocity: Mapped[float]
+    mean_rank: Mapped[float]  # Среднее позиции по Уэлфорду
+    m2: Mapped[float]  # Сумма квадратов отклонений от среднего по Уэлфорду
+    window_dates: Mapped[list[datetime]] = mapped_column(ARRAY(DateTime))  # Даты начала изменений за DAYS_COUNT дней
+    window_changes: Mapped[list[int]] = mapped_column(ARRAY(Integer))  # |Δrank| этих изменений
+    max_change: Mapped[Optional[int]]  # Максимальное |Δrank| за DAYS_COUNT дней
+
+    __table_args__ = (
+        UniqueConstraint("applicant_id", "direction", name="unique_rating_summary"),
+    )
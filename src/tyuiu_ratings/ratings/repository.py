@@ -1,18 +1,114 @@
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert
+from typing import Optional
+
+from collections.abc import AsyncIterator
+from datetime import timedelta
+
+from asyncpg import PostgresError
+from sqlalchemy import DateTime, Integer, ColumnElement, ScalarSelect, Insert, select, delete, func, table, column, case, literal, literal_column, null
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .schemas import Rating
-from .dto import RatingCreation
-from .models import RatingOrm
+from .dto import RatingCreation, RatingFeatures
+from .models import RatingOrm, RatingSummaryOrm
 from .base import RatingRepository
 from .exceptions import RatingCreationError, RatingReadingError
 
+from ..database import copy_to_staging_table
+from ..constants import (
+    DAYS_COUNT,
+    RATING_FEATURES_BATCH_SIZE,
+    RATING_SUMMARY_EWMA_ALPHA,
+    RATING_SUMMARY_LOCK_ID
+)
+
+
+# Колонки, которые заполняются при записи рейтинга:
+RATING_COLUMNS = tuple(RatingCreation.model_fields)
+# Колонки ответа в порядке полей Rating:
+RATING_RESPONSE_COLUMNS = tuple(RatingOrm.__table__.c[name] for name in Rating.model_fields)
+# Колонки сводки рейтингов в порядке выражений запросов обновления и пересборки:
+SUMMARY_COLUMNS = (
+    "applicant_id",
+    "direction",
+    "days",
+    "last_rank",
+    "last_date",
+    "previous_rank",
+    "velocity",
+    "acceleration",
+    "ewma_velocity",
+    "mean_rank",
+    "m2",
+    "window_dates",
+    "window_changes",
+    "max_change"
+)
+EMPTY_DATES = literal([], ARRAY(DateTime))
+EMPTY_CHANGES = literal([], ARRAY(Integer))
+
+
+def build_summary_rebuild(days_count: int = DAYS_COUNT) -> Insert:
+    """Запрос пересборки сводки рейтингов из полной истории одним запросом с оконными функциями.
+    Тем же запросом сводка заполняется в миграции, которая её создаёт.
+    """
+    series = (RatingOrm.applicant_id, RatingOrm.direction)
+    previous_rank = func.lag(RatingOrm.rank).over(partition_by=series, order_by=RatingOrm.date)
+    history = (
+        select(
+            *series,
+            RatingOrm.date,
+            RatingOrm.rank,
+            (RatingOrm.rank - previous_rank).label("change"),
+            (
+                previous_rank - func.lag(RatingOrm.rank, 2).over(partition_by=series, order_by=RatingOrm.date)
+            ).label("previous_change"),
+            func.lag(RatingOrm.date).over(partition_by=series, order_by=RatingOrm.date).label("previous_date"),
+            func.max(RatingOrm.date).over(partition_by=series).label("last_date"),
+            func.row_number().over(partition_by=series, order_by=RatingOrm.date).label("position"),
+            func.count().over(partition_by=series).label("days")
+        )
+        .subquery()
+    )
+    velocity = -func.coalesce(history.c.change, 0)
+    is_last_day = history.c.date == history.c.last_date
+    # Изменение попадает в окно, если в окне лежат оба соседних дня:
+    in_window = history.c.previous_date >= history.c.last_date - timedelta(days=days_count)
+    summary = select(
+        history.c.applicant_id,
+        history.c.direction,
+        func.count(),
+        func.max(history.c.rank).filter(is_last_day),
+        func.max(history.c.date),
+        func.max(history.c.rank - history.c.change).filter(is_last_day),
+        func.max(velocity).filter(is_last_day),
+        func.max(func.coalesce(history.c.previous_change, 0) + velocity).filter(is_last_day),
+        # EWMA в замкнутой форме: сумма α(1 - α)^(n - i) * velocity_i
+        func.sum(
+            RATING_SUMMARY_EWMA_ALPHA
+            * func.power(1 - RATING_SUMMARY_EWMA_ALPHA, history.c.days - history.c.position)
+            * velocity
+        ),
+        func.avg(history.c.rank),
+        func.var_pop(history.c.rank) * func.count(),
+        func.coalesce(
+            func.array_agg(aggregate_order_by(history.c.previous_date, history.c.date)).filter(in_window),
+            EMPTY_DATES
+        ),
+        func.coalesce(
+            func.array_agg(aggregate_order_by(func.abs(history.c.change), history.c.date)).filter(in_window),
+            EMPTY_CHANGES
+        ),
+        func.max(func.abs(history.c.change)).filter(in_window)
+    ).group_by(history.c.applicant_id, history.c.direction)
+    return insert(RatingSummaryOrm).from_select(SUMMARY_COLUMNS, summary)
+
 
 class SQLRatingRepository(RatingRepository):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, read_session: Optional[AsyncSession] = None) -> None:
         self.session = session
+        self.read_session = read_session or session
 
     async def bulk_upsert(self, ratings: list[RatingCreation]) -> None:
         try:
@@ -31,6 +127,38 @@ class SQLRatingRepository(RatingRepository):
             await self.session.rollback()
             raise RatingCreationError(f"Error while creating rating: {e}") from e
 
+    async def load_snapshot(self, ratings: list[RatingCreation], commit: bool = True) -> int:
+        """Загружает дневной срез через COPY во временную таблицу и сливает его по unique_rating,
+        в той же транзакции обновляет сводку рейтингов
+        """
+        records: dict[tuple, tuple] = {}
+        for rating in ratings:
+            record = tuple(getattr(rating, name) for name in RATING_COLUMNS)
+            records[(rating.applicant_id, rating.direction, rating.date)] = record
+        try:
+            staging_table = await copy_to_staging_table(
+                session=self.session,
+                table_name=RatingOrm.__tablename__,
+                columns=RATING_COLUMNS,
+                records=records.values()
+            )
+            staging = table(staging_table, *(column(name) for name in RATING_COLUMNS))
+            # Строки блокируются в порядке ключа, чтобы параллельные загрузки не взаимоблокировались
+            ordered = select(staging).order_by(staging.c.applicant_id, staging.c.direction, staging.c.date)
+            stmt = insert(RatingOrm).from_select(RATING_COLUMNS, ordered)
+            stmt = stmt.on_conflict_do_update(
+                constraint="unique_rating",
+                set_={"rank": stmt.excluded.rank, "updated_at": func.now()}
+            )
+            result = await self.session.execute(stmt)
+            await self._update_summary(staging_table)
+            if commit:
+                await self.session.commit()
+            return result.rowcount
+        except (SQLAlchemyError, PostgresError) as e:
+            await self.session.rollback()
+            raise RatingCreationError(f"Error while loading ratings snapshot: {e}") from e
+
     async def read(self, applicant_id: int, direction: str) -> list[Rating]:
         try:
             stmt = (
@@ -40,12 +168,143 @@ class SQLRatingRepository(RatingRepository):
                     RatingOrm.direction == direction
                 )
             )
-            results = await self.session.execute(stmt)
+            results = await self.read_session.execute(stmt)
             ratings = results.scalars().all()
             return [
                 Rating.model_validate(rating)
                 for rating in ratings
             ] if ratings else None
         except SQLAlchemyError as e:
-            await self.session.rollback()
+            await self.read_session.rollback()
             raise RatingReadingError(f"Error while reading history: {e}") from e
+
+    async def rebuild_summary(self, days_count: int = DAYS_COUNT) -> int:
+        """Пересобирает сводку рейтингов из полной истории"""
+        try:
+            # Эксклюзивная блокировка дожидается загрузок срезов, которые держат её разделяемо
+            await self.session.execute(select(func.pg_advisory_xact_lock(RATING_SUMMARY_LOCK_ID)))
+            await self.session.execute(delete(RatingSummaryOrm))
+            result = await self.session.execute(build_summary_rebuild(days_count))
+            await self.session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise RatingCreationError(f"Error while rebuilding rating summary: {e}") from e
+
+    async def stream_features(
+            self,
+            batch_size: int = RATING_FEATURES_BATCH_SIZE
+    ) -> AsyncIterator[list[RatingFeatures]]:
+        """Отдаёт признаки рейтинга всех (applicant_id, direction) из сводки пачками из серверного курсора"""
+        stmt = (
+            select(
+                RatingSummaryOrm.applicant_id,
+                RatingSummaryOrm.direction,
+                RatingSummaryOrm.days,
+                RatingSummaryOrm.velocity,
+                RatingSummaryOrm.acceleration,
+                RatingSummaryOrm.ewma_velocity,
+                case(
+                    (RatingSummaryOrm.days > 1, func.sqrt(RatingSummaryOrm.m2 / (RatingSummaryOrm.days - 1))),
+                    else_=None
+                ).label("stability"),
+                RatingSummaryOrm.max_change
+            )
+            .order_by(RatingSummaryOrm.applicant_id, RatingSummaryOrm.direction)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            results = await self.read_session.stream(stmt)
+            async for rows in results.mappings().partitions():
+                yield [RatingFeatures.model_validate(dict(row)) for row in rows]
+        except SQLAlchemyError as e:
+            await self.read_session.rollback()
+            raise RatingReadingError(f"Error while streaming rating features: {e}") from e
+
+    async def _update_summary(self, staging_table: str, days_count: int = DAYS_COUNT) -> None:
+        """Добавляет в сводку последний срез каждого (applicant_id, direction) из временной таблицы.
+        Новое состояние считается в ON CONFLICT DO UPDATE от текущей строки сводки, поэтому
+        параллельные загрузки блокируют только свои строки и в порядке ключа.
+        Срезы не новее last_date сводки только обновляют updated_at, их учитывает rebuild_summary.
+        """
+        staging = table(staging_table, *(column(name) for name in RATING_COLUMNS))
+        incoming = (
+            select(staging.c.applicant_id, staging.c.direction, staging.c.rank, staging.c.date)
+            .distinct(staging.c.applicant_id, staging.c.direction)
+            .order_by(staging.c.applicant_id, staging.c.direction, staging.c.date.desc())
+            .subquery("incoming")
+        )
+        # Сводка ряда, у которого это первый срез:
+        first_day = (
+            select(
+                incoming.c.applicant_id,
+                incoming.c.direction,
+                literal(1),
+                incoming.c.rank,
+                incoming.c.date,
+                null(),
+                literal(0.0),
+                literal(0.0),
+                literal(0.0),
+                incoming.c.rank,
+                literal(0.0),
+                EMPTY_DATES,
+                EMPTY_CHANGES,
+                null()
+            )
+            .order_by(incoming.c.applicant_id, incoming.c.direction)
+        )
+        stmt = insert(RatingSummaryOrm).from_select(SUMMARY_COLUMNS, first_day)
+        summary = RatingSummaryOrm
+        # Значения входящей строки из EXCLUDED. Колонки stmt.excluded в подзапросах SET добавили бы excluded во FROM
+        rank = literal_column("excluded.last_rank", Integer)
+        date = literal_column("excluded.last_date", DateTime)
+        # Окно изменений: старые изменения плюс новое, без вышедших за days_count дней от нового среза
+        entries = func.unnest(
+            func.array_append(summary.window_dates, summary.last_date),
+            func.array_append(summary.window_changes, func.abs(rank - summary.last_rank))
+        ).table_valued("date", "change", with_ordinality="position").render_derived(name="entries")
+
+        def window(aggregate: ColumnElement) -> ScalarSelect:
+            return (
+                select(aggregate)
+                .where(entries.c.date >= date - timedelta(days=days_count))
+                .scalar_subquery()
+            )
+
+        days = summary.days + 1
+        velocity = summary.last_rank - rank
+        # Шаг Уэлфорда для среднего и суммы квадратов отклонений:
+        delta = rank - summary.mean_rank
+        next_mean_rank = summary.mean_rank + delta / days
+        next_values = {
+            "days": days,
+            "last_rank": rank,
+            "last_date": date,
+            "previous_rank": summary.last_rank,
+            "velocity": velocity,
+            "acceleration": velocity - summary.velocity,
+            "ewma_velocity": RATING_SUMMARY_EWMA_ALPHA * velocity
+            + (1 - RATING_SUMMARY_EWMA_ALPHA) * summary.ewma_velocity,
+            "mean_rank": next_mean_rank,
+            "m2": summary.m2 + delta * (rank - next_mean_rank),
+            "window_dates": func.coalesce(
+                window(func.array_agg(aggregate_order_by(entries.c.date, entries.c.position))), EMPTY_DATES
+            ),
+            "window_changes": func.coalesce(
+                window(func.array_agg(aggregate_order_by(entries.c.change, entries.c.position))), EMPTY_CHANGES
+            ),
+            "max_change": window(func.max(entries.c.change))
+        }
+        # Перезапись уже учтённого среза меняет историю без пересчёта сводки, но updated_at служит версией истории
+        is_next_day = date > summary.last_date
+        stmt = stmt.on_conflict_do_update(
+            constraint="unique_rating_summary",
+            set_={
+                **{name: case((is_next_day, value), else_=getattr(summary, name)) for name, value in next_values.items()},
+                "updated_at": func.now()
+            }
+        )
+        # Разделяемая блокировка не упорядочивает загрузки между собой, только исключает пересборку сводки
+        await self.session.execute(select(func.pg_advisory_xact_lock_shared(RATING_SUMMARY_LOCK_ID)))
+        await self.session.execute(stmt)
@@ -0,0 +1,35 @@
+"""Пересборка сводки рейтингов из полной истории.
+
+При создании таблицы rating_summary сводку заполняет миграция, пересборка
+нужна после ручных правок истории рейтингов и после загрузки срезов задним числом.
+
+    python -m src.tyuiu_ratings.rebuild_rating_summary --days 10
+"""
+
+import sys
+import asyncio
+import argparse
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from .ratings.repository import SQLRatingRepository
+from .settings import PostgresSettings
+from .constants import DAYS_COUNT
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Пересборка сводки рейтингов")
+    parser.add_argument("--days", type=int, default=DAYS_COUNT)
+    args = parser.parse_args()
+    engine = create_async_engine(url=PostgresSettings().sqlalchemy_url)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            rows = await SQLRatingRepository(session).rebuild_summary(days_count=args.days)
+    finally:
+        await engine.dispose()
+    print(f"Rating summary rebuilt: {rows} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
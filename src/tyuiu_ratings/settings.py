@@ -1,8 +1,23 @@
+from typing import Optional
+
 import os
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
-
-from .constants import ENV_PATH, PG_DRIVER
+from sqlalchemy import make_url
+
+from .constants import (
+    ENV_PATH,
+    PG_DRIVER,
+    DEFAULT_HTTP_POOL_LIMIT,
+    DEFAULT_HTTP_POOL_LIMIT_PER_HOST,
+    DEFAULT_HTTP_DNS_CACHE_TTL,
+    DEFAULT_HTTP_CONNECT_TIMEOUT,
+    DEFAULT_HTTP_READ_TIMEOUT,
+    DEFAULT_HTTP_KEEPALIVE_TIMEOUT,
+    DEFAULT_RABBIT_PREFETCH_COUNT,
+    DEFAULT_RABBIT_CONSUMER_CONCURRENCY,
+    DEFAULT_MAX_REPLICA_LAG
+)
 
 
 load_dotenv(ENV_PATH)
@@ -11,16 +26,30 @@ load_dotenv(ENV_PATH)
 class APISettings(BaseSettings):
     CLASSIFIER_URL: str = os.getenv("CLASSIFIER_URL")
     REC_SYS_URL: str = os.getenv("REC_SYS_URL")
+    CLASSIFIER_MODEL_VERSION: str = os.getenv("CLASSIFIER_MODEL_VERSION", "")
+
+
+class HTTPSettings(BaseSettings):
+    HTTP_POOL_LIMIT: int = os.getenv("HTTP_POOL_LIMIT", DEFAULT_HTTP_POOL_LIMIT)
+    HTTP_POOL_LIMIT_PER_HOST: int = os.getenv("HTTP_POOL_LIMIT_PER_HOST", DEFAULT_HTTP_POOL_LIMIT_PER_HOST)
+    HTTP_DNS_CACHE_TTL: int = os.getenv("HTTP_DNS_CACHE_TTL", DEFAULT_HTTP_DNS_CACHE_TTL)
+    HTTP_CONNECT_TIMEOUT: float = os.getenv("HTTP_CONNECT_TIMEOUT", DEFAULT_HTTP_CONNECT_TIMEOUT)
+    HTTP_READ_TIMEOUT: float = os.getenv("HTTP_READ_TIMEOUT", DEFAULT_HTTP_READ_TIMEOUT)
+    HTTP_KEEPALIVE_TIMEOUT: float = os.getenv("HTTP_KEEPALIVE_TIMEOUT", DEFAULT_HTTP_KEEPALIVE_TIMEOUT)
 
 
 class RedisSettings(BaseSettings):
-    REDIS_HOST: str = os.getenv("REDIS_HOST")
-    REDIS_PORT: int = os.getenv("REDIS_PORT")
+    REDIS_HOST: Optional[str] = os.getenv("REDIS_HOST")
+    REDIS_PORT: Optional[int] = os.getenv("REDIS_PORT")
 
     @property
     def redis_url(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/0"
 
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.REDIS_HOST)
+
 
 class PostgresSettings(BaseSettings):
     PG_HOST: str = os.getenv("POSTGRES_HOST")
@@ -28,17 +57,32 @@ class PostgresSettings(BaseSettings):
     PG_USER: str = os.getenv("POSTGRES_USER")
     PG_PASSWORD: str = os.getenv("POSTGRES_PASSWORD")
     PG_DB: str = os.getenv("POSTGRES_DB")
+    PG_REPLICA_DSNS: Optional[str] = os.getenv("POSTGRES_REPLICA_DSNS")  # DSN реплик через запятую
+    PG_MAX_REPLICA_LAG: float = os.getenv("POSTGRES_MAX_REPLICA_LAG", DEFAULT_MAX_REPLICA_LAG)
 
     @property
     def sqlalchemy_url(self) -> str:
         return f"postgresql+{PG_DRIVER}://{self.PG_USER}:{self.PG_PASSWORD}@{self.PG_HOST}:{self.PG_PORT}/{self.PG_DB}"
 
+    @property
+    def replica_urls(self) -> list[str]:
+        if not self.PG_REPLICA_DSNS:
+            return []
+        # Схема DSN (postgres://, postgresql://, postgresql+psycopg://) заменяется на асинхронный драйвер
+        return [
+            make_url(dsn.strip()).set(drivername=f"postgresql+{PG_DRIVER}").render_as_string(hide_password=False)
+            for dsn in self.PG_REPLICA_DSNS.split(",")
+            if dsn.strip()
+        ]
+
 
 class RabbitSettings(BaseSettings):
     RABBIT_HOST: str = os.getenv("RABBIT_HOST")
     RABBIT_PORT: int = os.getenv("RABBIT_PORT")
     RABBIT_USER: str = os.getenv("RABBIT_USER")
     RABBIT_PASSWORD: str = os.getenv("RABBIT_PASSWORD")
+    RABBIT_PREFETCH_COUNT: int = os.getenv("RABBIT_PREFETCH_COUNT", DEFAULT_RABBIT_PREFETCH_COUNT)
+    RABBIT_CONSUMER_CONCURRENCY: int = os.getenv("RABBIT_CONSUMER_CONCURRENCY", DEFAULT_RABBIT_CONSUMER_CONCURRENCY)
 
     @property
     def rabbit_url(self) -> str:
@@ -47,6 +91,7 @@ class RabbitSettings(BaseSettings):
 
 class Settings(BaseSettings):
     api: APISettings = APISettings()
+    http: HTTPSettings = HTTPSettings()
     redis: RedisSettings = RedisSettings()
     postgres: PostgresSettings = PostgresSettings()
     rabbit: RabbitSettings = RabbitSettings()
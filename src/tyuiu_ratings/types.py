@@ -1,6 +1,8 @@
-from typing import TypeAlias
+from typing import Any, TypeAlias
 
 from .profiles.schemas import Exam
 
 
 ExamList: TypeAlias = list[Exam]
+
+Row: TypeAlias = dict[str, Any]  # Строка из БД с полями схемы ответа в том же порядке
@@ -1,11 +1,23 @@
-from typing import Optional, TYPE_CHECKING
+from typing import Any, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .ratings.schemas import Rating
 
-import pandas as pd
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
 
-from .constants import DIRECTIONS_MAPPING_CSV
+from .directions.mapping import directions_mapper
+from .ratings.analytics import (
+    RatingHistories,
+    calculate_stable,
+    calculate_max_changes,
+    calculate_velocities,
+    calculate_stabilities,
+    calculate_accelerations,
+    calculate_mean_velocities
+)
 
 
 def calculate_pages(total_count: int, limit: int) -> int:
@@ -14,51 +26,58 @@ def calculate_pages(total_count: int, limit: int) -> int:
     return pages
 
 
+def encode_cursor(values: dict[str, Any]) -> str:
+    """Кодирует позицию keyset-пагинации в непрозрачный токен"""
+    payload = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Декодирует токен keyset-пагинации, ValueError если токен повреждён"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, dict):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+
+def timestamp_version(timestamp: datetime) -> int:
+    """Версия для ETag из метки времени, точная до микросекунды"""
+    return (timestamp.replace(tzinfo=None) - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+
+
 def calculate_velocity(ratings: list["Rating"]) -> list[float]:
     """Вычисляет изменения позиций в рейтинге"""
-    df = pd.DataFrame([rating.model_dump() for rating in ratings])
-    df.set_index("date", inplace=True)
-    df["rank_change"] = df["rank"].diff().fillna(0)
-    return -df["rank_change"].to_list()
+    histories = RatingHistories.from_ratings([ratings])
+    return calculate_velocities(histories).tolist()
 
 
 def calculate_mean_velocity(ratings: list["Rating"]) -> float:
     """Вычисляет среднее изменение в позиции в рейтинге"""
-    df = pd.DataFrame([rating.model_dump() for rating in ratings])
-    df.set_index("date", inplace=True)
-    df["rank_change"] = df["rank"].diff().fillna(0)
-    return -df["rank_change"].mean()
+    histories = RatingHistories.from_ratings([ratings])
+    return float(calculate_mean_velocities(histories)[0])
 
 
 def calculate_acceleration(ratings: list["Rating"]) -> list[float]:
     """Вычисляет скорость изменений позиций в рейтинге"""
-    df = pd.DataFrame([rating.model_dump() for rating in ratings])
-    df.set_index("date", inplace=True)
-    df["rank_change"] = df["rank"].diff().fillna(0)
-    df["acceleration"] = -df["rank_change"].diff()
-    return df["acceleration"].fillna(0).to_list()
+    histories = RatingHistories.from_ratings([ratings])
+    return calculate_accelerations(histories).tolist()
 
 
 def calculate_stability(ratings: list["Rating"]) -> float:
     """Вычисляет стабильность изменений в рейтинге"""
-    df = pd.DataFrame([rating.model_dump() for rating in ratings])
-    df.set_index("date", inplace=True)
-    return df["rank"].std()
+    histories = RatingHistories.from_ratings([ratings])
+    return float(calculate_stabilities(histories)[0])
 
 
 def is_rating_stable(ratings: list["Rating"], days_count: int, max_change: int) -> bool:
     """Проверяет стабильность позиции в рейтинге за N-ое количество дней """
-    df = pd.DataFrame([rating.model_dump() for rating in ratings])
-    df.set_index("date", inplace=True)
-    cutoff_date = df.index.max() - pd.Timedelta(days=days_count)
-    last_days = df[df.index >= cutoff_date]
-    if len(last_days) < 2:
-        return True
-    changes = last_days["rank"].diff().abs().dropna()
-    return changes.max() <= max_change
+    histories = RatingHistories.from_ratings([ratings])
+    return bool(calculate_stable(calculate_max_changes(histories, days_count), max_change)[0])
 
 
 def mapping_direction(direction: str) -> Optional[str]:
-    df = pd.read_csv(DIRECTIONS_MAPPING_CSV)
-    idx = df.index[df["Направление подготовки 2025"] == direction].tolist()
-    return df.loc[idx[0], "Направление подготовки"] if idx else None
+    return directions_mapper.map(direction)
@@ -0,0 +1,110 @@
+import math
+from datetime import datetime, timedelta
+
+import pandas as pd
+from hypothesis import given, strategies as st
+
+from src.tyuiu_ratings.ratings.analytics import RatingHistories, analyze_ratings
+from src.tyuiu_ratings.ratings.schemas import Rating
+from src.tyuiu_ratings.utils import (
+    calculate_velocity,
+    calculate_mean_velocity,
+    calculate_acceleration,
+    calculate_stability,
+    is_rating_stable
+)
+
+START_DATE = datetime(2026, 6, 20)
+
+
+def to_frame(ratings: list[Rating]) -> pd.DataFrame:
+    df = pd.DataFrame([rating.model_dump() for rating in ratings])
+    df.set_index("date", inplace=True)
+    return df
+
+
+# Прежние реализации на pandas, с которыми сравниваются обёртки:
+
+def pandas_velocity(ratings: list[Rating]) -> list[float]:
+    df = to_frame(ratings)
+    return (-df["rank"].diff().fillna(0)).to_list()
+
+
+def pandas_mean_velocity(ratings: list[Rating]) -> float:
+    df = to_frame(ratings)
+    return -df["rank"].diff().fillna(0).mean()
+
+
+def pandas_acceleration(ratings: list[Rating]) -> list[float]:
+    df = to_frame(ratings)
+    df["rank_change"] = df["rank"].diff().fillna(0)
+    df["acceleration"] = -df["rank_change"].diff()
+    return df["acceleration"].fillna(0).to_list()
+
+
+def pandas_stability(ratings: list[Rating]) -> float:
+    return to_frame(ratings)["rank"].std()
+
+
+def pandas_is_stable(ratings: list[Rating], days_count: int, max_change: int) -> bool:
+    df = to_frame(ratings)
+    cutoff_date = df.index.max() - pd.Timedelta(days=days_count)
+    last_days = df[df.index >= cutoff_date]
+    if len(last_days) < 2:
+        return True
+    changes = last_days["rank"].diff().abs().dropna()
+    return changes.max() <= max_change
+
+
+def same_float(left: float, right: float) -> bool:
+    return (math.isnan(left) and math.isnan(right)) or left == right
+
+
+@st.composite
+def histories(draw, min_size: int = 1) -> list[Rating]:
+    """История рейтинга по возрастающим датам, возможно с пропущенными днями"""
+    ranks = draw(st.lists(st.integers(min_value=1, max_value=5000), min_size=min_size, max_size=40))
+    gaps = draw(st.lists(st.integers(min_value=1, max_value=3), min_size=len(ranks), max_size=len(ranks)))
+    dates, date = [], START_DATE
+    for gap in gaps:
+        date += timedelta(days=gap)
+        dates.append(date)
+    return [Rating(rank=rank, date=date) for rank, date in zip(ranks, dates)]
+
+
+@given(histories())
+def test_velocity_matches_pandas(ratings):
+    assert calculate_velocity(ratings) == pandas_velocity(ratings)
+
+
+@given(histories())
+def test_mean_velocity_matches_pandas(ratings):
+    assert same_float(calculate_mean_velocity(ratings), pandas_mean_velocity(ratings))
+
+
+@given(histories())
+def test_acceleration_matches_pandas(ratings):
+    assert calculate_acceleration(ratings) == pandas_acceleration(ratings)
+
+
+@given(histories())
+def test_stability_matches_pandas(ratings):
+    assert same_float(calculate_stability(ratings), pandas_stability(ratings))
+
+
+@given(histories(), st.integers(min_value=0, max_value=15), st.integers(min_value=0, max_value=100))
+def test_is_rating_stable_matches_pandas(ratings, days_count, max_change):
+    assert is_rating_stable(ratings, days_count, max_change) == pandas_is_stable(ratings, days_count, max_change)
+
+
+@given(st.lists(histories(), min_size=1, max_size=10))
+def test_batch_matches_single_series(series):
+    metrics = analyze_ratings(RatingHistories.from_ratings(series))
+    offset = 0
+    for index, ratings in enumerate(series):
+        rows = slice(offset, offset + len(ratings))
+        assert metrics.velocity[rows].tolist() == calculate_velocity(ratings)
+        assert metrics.acceleration[rows].tolist() == calculate_acceleration(ratings)
+        assert same_float(float(metrics.mean_velocity[index]), calculate_mean_velocity(ratings))
+        assert same_float(float(metrics.stability[index]), calculate_stability(ratings))
+        offset += len(ratings)
@@ -0,0 +1,47 @@
+import asyncio
+
+from src.tyuiu_ratings.applicants.cache import ChangeLogVersions
+from src.tyuiu_ratings.responses import make_etag
+
+
+class VersionSource:
+    """Версия направления в БД со счётчиком запросов"""
+    def __init__(self, version: int) -> None:
+        self.version = version
+        self.loads = 0
+
+    async def load(self) -> int:
+        self.loads += 1
+        return self.version
+
+
+def test_version_is_served_from_cache_until_invalidated():
+    async def run():
+        versions, source = ChangeLogVersions(), VersionSource(5)
+        assert await versions.get_direction_version("ИВТ", source.load) == 5
+        source.version = 7
+        assert await versions.get_direction_version("ИВТ", source.load) == 5
+        versions.invalidate([(1, "ИВТ")])
+        assert await versions.get_direction_version("ИВТ", source.load) == 7
+        assert source.loads == 2
+    asyncio.run(run())
+
+
+def test_version_read_during_invalidation_is_not_cached():
+    async def run():
+        versions, source = ChangeLogVersions(), VersionSource(5)
+
+        async def load_with_ingest() -> int:
+            version = await source.load()
+            versions.invalidate([(1, "ИВТ")])
+            source.version = 7
+            return version
+
+        assert await versions.get_applicant_version(1, load_with_ingest) == 5
+        assert await versions.get_applicant_version(1, source.load) == 7
+    asyncio.run(run())
+
+
+def test_delta_etag_differs_from_full_response():
+    assert make_etag(42) != make_etag(42, 0)
+    assert make_etag(42, 10) != make_etag(42, 11)
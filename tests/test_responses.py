@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from src.tyuiu_ratings.applicants.dto import CreatedApplicant
+from src.tyuiu_ratings.ratings.dto import RatingCreation, RatingFeatures
+from src.tyuiu_ratings.responses import dump_json
+
+
+def fastapi_dump(content) -> bytes:
+    """Сериализация как в стандартном JSONResponse FastAPI"""
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+def applicant_row(probability: float = 0.5) -> dict:
+    return CreatedApplicant(
+        applicant_id=1234567,
+        rank=17,
+        institute="Институт информационных технологий",
+        direction="Информатика и вычислительная техника",
+        priority=1,
+        points=245,
+        bonus_points=5,
+        original=True,
+        probability=probability,
+        created_at=datetime(2026, 7, 20, 9, 0),
+        updated_at=datetime(2026, 7, 21, 12, 30, 15, 123456)
+    ).model_dump()
+
+
+def rating_row() -> dict:
+    return RatingCreation(
+        applicant_id=1234567,
+        direction="Информатика и вычислительная техника",
+        rank=3,
+        date=datetime(2026, 7, 21)
+    ).model_dump()
+
+
+def features_row(value: float = 0.0) -> dict:
+    return RatingFeatures(
+        applicant_id=1234567,
+        direction="Информатика и вычислительная техника",
+        days=5,
+        velocity=value,
+        acceleration=-0.0,
+        ewma_velocity=value,
+        stability=None,
+        max_change=2.0
+    ).model_dump()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        [],
+        [applicant_row()],
+        [rating_row(), rating_row()],
+        [features_row()],
+        {"applicants": [applicant_row()], "next_cursor": None}
+    ]
+)
+def test_dump_json_matches_fastapi(content):
+    assert dump_json(content) == fastapi_dump(content)
+
+
+@pytest.mark.parametrize("value", [1e-4, 9999999999999998.0, 0.1, 1 / 3, 123456.789, -2.5])
+def test_dump_json_plain_floats_match_fastapi(value):
+    content = [applicant_row(value), features_row(value)]
+    assert dump_json(content) == fastapi_dump(content)
+
+
+@pytest.mark.parametrize("value", [1e-5, -1.5e-7, 1e16, 1e17, -2.5e20, 5e-324, 1.7976931348623157e308])
+def test_dump_json_exponent_floats_keep_values(value):
+    content = [applicant_row(value), features_row(value)]
+    assert json.loads(dump_json(content)) == json.loads(fastapi_dump(content))